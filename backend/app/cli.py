@@ -0,0 +1,52 @@
+"""Command line tools, run from the backend directory:
+
+    python -m app.cli export-articles --user alice --format csv --output articles.csv
+"""
+import argparse
+import sys
+from datetime import datetime
+from app.database import SessionLocal
+from app.services import UserService
+from app.services.export import ExportService, EXPORT_FORMATS
+
+
+def export_articles(args) -> int:
+    """Write a user's articles to a file (or stdout), streamed like the API export"""
+    db = SessionLocal()
+    try:
+        user = UserService.get_user_by_username(db, args.user)
+    finally:
+        db.close()
+    if not user:
+        print(f"User not found: {args.user}", file=sys.stderr)
+        return 1
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for data in ExportService.stream(user.id, args.format, args.feed_id, args.since, args.with_content):
+            output.write(data)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Tech Watch command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-articles", help="Export a user's articles with scores and keyword hits")
+    export.add_argument("--user", required=True, help="Username")
+    export.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    export.add_argument("--output", help="Output file (default: stdout)")
+    export.add_argument("--feed-id", type=int, help="Only export this feed")
+    export.add_argument("--since", type=datetime.fromisoformat,
+                        help="Only articles stored at or after this time (ISO 8601)")
+    export.add_argument("--with-content", action="store_true", help="Include article bodies")
+    export.set_defaults(handler=export_articles)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
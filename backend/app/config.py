@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from typing import List
 import os
+import tempfile
 from pathlib import Path
 
 class Settings(BaseSettings):
@@ -11,6 +12,8 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-this"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Authenticated users are cached in memory for this many seconds (0 disables the cache)
+    auth_cache_ttl_seconds: float = 30.0
     
     # API
     api_host: str = "0.0.0.0"
@@ -24,6 +27,68 @@ class Settings(BaseSettings):
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:5173", "http://localhost:8001"]
     # Admin users allowed to run maintenance endpoints (comma-separated in env var ADMIN_USERS)
     admin_users: List[str] = ["admin"]
+
+    # Feed sync: maximum number of feeds downloaded concurrently by sync_all
+    sync_max_workers: int = 8
+
+    # Background sync scheduler (runs in a single worker, elected through a lock file)
+    scheduler_enabled: bool = True
+    scheduler_tick_seconds: int = 60
+    scheduler_batch_size: int = 50
+    scheduler_lock_file: str = str(Path(tempfile.gettempdir()) / "techwatch-scheduler.lock")
+    # Adaptive polling interval bounds (minutes) and back-off for quiet feeds
+    sync_min_interval_minutes: int = 15
+    sync_max_interval_minutes: int = 720
+    sync_backoff_factor: float = 1.5
+    sync_rate_window_days: int = 7
+
+    # Shared HTTP client used by the RSS reader and web scraper
+    http_pool_size: int = 50  # Number of hosts with cached keep-alive connections
+    http_max_per_host: int = 2  # Concurrent requests per host
+    http_min_host_interval: float = 0.5  # Seconds between two requests to the same host
+    http_timeout: float = 15.0
+
+    # Background rescore jobs
+    rescore_workers: int = 0  # Scoring processes, 0 = one per CPU
+    rescore_chunk_size: int = 1000  # Articles per checkpointed chunk
+    rescore_stale_seconds: int = 600  # A pending or running job without heartbeat for this long is resumed
+
+    # Search ranking: search_score = relevance_weight * relevance + base_score_weight * base_score
+    search_relevance_weight: float = 1.0
+    search_base_score_weight: float = 0.1
+    search_column_weights: List[float] = [4.0, 2.0, 1.0]  # BM25 weights of title, description, content
+    search_snippet_tokens: int = 16  # Approximate length of highlighted snippets
+
+    # HTTP caching of listings: scores and feed health also change with time, so
+    # their ETags are renewed at least this often (seconds) even without data changes
+    etag_time_bucket_seconds: int = 300
+
+    # Read marks of opened articles are queued and written in batches every this many
+    # seconds (0 writes them during the request), or as soon as this many are waiting
+    read_mark_flush_seconds: float = 2.0
+    read_mark_batch_size: int = 500
+
+    # Article exports: rows fetched from the database per round trip
+    export_chunk_size: int = 1000
+
+    # Article retention: the scheduler purges articles older than purge_after_days (0 = only
+    # feeds with their own retention_days) every purge_interval_hours (0 disables it), the
+    # first time one full interval after startup.
+    # Purges delete purge_chunk_size articles per transaction and keep starred articles
+    # unless purge_keep_starred is off
+    purge_after_days: int = 0
+    purge_interval_hours: int = 24
+    purge_chunk_size: int = 500
+    purge_keep_starred: bool = True
+
+    # Cold storage: the bodies (description and content) of articles older than
+    # archive_after_days (0 disables it) are moved, compressed, to article_archives
+    # every archive_interval_hours. archive_codec is "zlib" or "zstd" (needs the
+    # zstandard package); archived bodies are decompressed when an article is read
+    archive_after_days: int = 0
+    archive_interval_hours: int = 24
+    archive_chunk_size: int = 500
+    archive_codec: str = "zlib"
     
     class Config:
         env_file = ".env"
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.utils.compression import archive_text
 
 # For SQLite, use check_same_thread=False for async compatibility
 engine = create_engine(
@@ -9,6 +10,12 @@ engine = create_engine(
     echo=False
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def register_functions(dbapi_connection, connection_record):
+        """SQL functions used by the full-text index (archived bodies, see app.services.search)"""
+        dbapi_connection.create_function("archive_text", 3, archive_text, deterministic=True)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
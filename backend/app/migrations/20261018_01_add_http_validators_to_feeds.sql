@@ -0,0 +1,3 @@
+-- Add HTTP conditional GET validators to feeds table
+ALTER TABLE feeds ADD COLUMN etag VARCHAR(255);
+ALTER TABLE feeds ADD COLUMN last_modified VARCHAR(100);
@@ -0,0 +1,4 @@
+-- Add adaptive polling schedule to feeds table
+ALTER TABLE feeds ADD COLUMN next_sync_at DATETIME;
+ALTER TABLE feeds ADD COLUMN sync_interval INTEGER;
+CREATE INDEX ix_feeds_next_sync_at ON feeds (next_sync_at);
@@ -0,0 +1,3 @@
+-- Indexes supporting database-side article ranking
+CREATE INDEX ix_articles_feed_id ON articles (feed_id);
+CREATE INDEX ix_user_article_interactions_user_article ON user_article_interactions (user_id, article_id);
@@ -0,0 +1,2 @@
+-- Add per-user listing version (HTTP ETags of article, feed and keyword listings)
+ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0;
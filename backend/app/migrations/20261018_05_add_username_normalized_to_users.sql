@@ -0,0 +1,11 @@
+-- Add indexed lowercase username for case-insensitive lookups, unique like the username itself.
+-- Usernames that differ only by case must be renamed first: this check fails (CHECK constraint)
+-- while any remain; list them with
+--   SELECT lower(username), COUNT(*) FROM users GROUP BY lower(username) HAVING COUNT(*) > 1;
+CREATE TEMP TABLE username_case_collisions (collisions INTEGER CHECK (collisions = 0));
+INSERT INTO username_case_collisions
+SELECT COUNT(*) FROM (SELECT lower(username) FROM users GROUP BY lower(username) HAVING COUNT(*) > 1) AS duplicates;
+DROP TABLE username_case_collisions;
+ALTER TABLE users ADD COLUMN username_normalized VARCHAR(50);
+UPDATE users SET username_normalized = lower(username);
+CREATE UNIQUE INDEX ix_users_username_normalized ON users (username_normalized);
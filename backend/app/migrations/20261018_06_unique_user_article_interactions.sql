@@ -0,0 +1,15 @@
+-- One interaction per (user, article): merge duplicates into the oldest row, then enforce it
+UPDATE user_article_interactions SET
+    is_liked = (SELECT MAX(d.is_liked) FROM user_article_interactions d
+                WHERE d.user_id = user_article_interactions.user_id AND d.article_id = user_article_interactions.article_id),
+    is_starred = (SELECT MAX(d.is_starred) FROM user_article_interactions d
+                  WHERE d.user_id = user_article_interactions.user_id AND d.article_id = user_article_interactions.article_id),
+    is_read = (SELECT MAX(d.is_read) FROM user_article_interactions d
+               WHERE d.user_id = user_article_interactions.user_id AND d.article_id = user_article_interactions.article_id)
+WHERE id IN (SELECT MIN(id) FROM user_article_interactions GROUP BY user_id, article_id HAVING COUNT(*) > 1);
+UPDATE user_article_interactions SET user_score_boost = CASE WHEN is_liked THEN 5.0 ELSE 0.0 END
+WHERE id IN (SELECT MIN(id) FROM user_article_interactions GROUP BY user_id, article_id HAVING COUNT(*) > 1);
+DELETE FROM user_article_interactions
+WHERE id NOT IN (SELECT MIN(id) FROM user_article_interactions GROUP BY user_id, article_id);
+DROP INDEX IF EXISTS ix_user_article_interactions_user_article;
+CREATE UNIQUE INDEX ix_user_article_interactions_user_article ON user_article_interactions (user_id, article_id);
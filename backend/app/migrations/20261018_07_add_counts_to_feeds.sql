@@ -0,0 +1,17 @@
+-- Add cached per-feed counts for the feed list (kept up to date by FeedService.refresh_counts)
+ALTER TABLE feeds ADD COLUMN article_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE feeds ADD COLUMN unread_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE feeds ADD COLUMN starred_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE feeds ADD COLUMN last_sync_count INTEGER NOT NULL DEFAULT 0;
+-- Counted per article, so duplicate interactions count once even if 20261018_06_unique_user_article_interactions.sql
+-- has not merged them: read/starred when any of them is
+UPDATE feeds SET
+    article_count = (SELECT COUNT(*) FROM articles WHERE articles.feed_id = feeds.id),
+    unread_count = (SELECT COUNT(*) FROM articles
+                    WHERE articles.feed_id = feeds.id
+                      AND NOT EXISTS (SELECT 1 FROM user_article_interactions i
+                                      WHERE i.article_id = articles.id AND i.user_id = feeds.user_id AND i.is_read)),
+    starred_count = (SELECT COUNT(*) FROM articles
+                     WHERE articles.feed_id = feeds.id
+                       AND EXISTS (SELECT 1 FROM user_article_interactions i
+                                   WHERE i.article_id = articles.id AND i.user_id = feeds.user_id AND i.is_starred));
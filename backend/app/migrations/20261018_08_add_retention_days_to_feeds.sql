@@ -0,0 +1,2 @@
+-- Per-feed article retention (NULL = global purge age, 0 = keep forever)
+ALTER TABLE feeds ADD COLUMN retention_days INTEGER;
@@ -0,0 +1,2 @@
+-- Cold storage flag: the article body lives compressed in article_archives (created by the app)
+ALTER TABLE articles ADD COLUMN is_archived BOOLEAN NOT NULL DEFAULT 0;
@@ -0,0 +1,12 @@
+-- Time-independent ranking key of the score listing (kept up to date by ArticleService.refresh_rank):
+-- base_score + the feed owner's like boost + 0.25 per day of publication
+ALTER TABLE articles ADD COLUMN rank_score FLOAT NOT NULL DEFAULT 0;
+UPDATE articles SET rank_score =
+    COALESCE(base_score, 0.0)
+    + CASE WHEN EXISTS (SELECT 1 FROM user_article_interactions i
+                        JOIN feeds ON feeds.user_id = i.user_id
+                        WHERE i.article_id = articles.id AND feeds.id = articles.feed_id AND i.is_liked)
+           THEN 5.0 ELSE 0.0 END
+    + 0.25 * julianday(COALESCE(published_date, created_at));
+CREATE INDEX ix_articles_rank_score ON articles (rank_score);
+CREATE INDEX ix_articles_feed_rank_score ON articles (feed_id, rank_score);
@@ -7,6 +7,10 @@ from .article import Article
 from .article_keyword import ArticleKeyword
 from .user_article_interaction import UserArticleInteraction
 from .app_config import AppConfig
+from .maintenance_job import MaintenanceJob
+from .saved_search import SavedSearch, SavedSearchMatch
+from .daily_stat import KeywordDailyStat, ArticleDailyRead
+from .article_archive import ArticleArchive
 
 __all__ = [
     "User",
@@ -16,4 +20,10 @@ __all__ = [
     "ArticleKeyword",
     "UserArticleInteraction",
     "AppConfig",
+    "MaintenanceJob",
+    "SavedSearch",
+    "SavedSearchMatch",
+    "KeywordDailyStat",
+    "ArticleDailyRead",
+    "ArticleArchive",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,7 +7,7 @@ class Article(Base):
     __tablename__ = "articles"
     
     id = Column(Integer, primary_key=True, index=True)
-    feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
+    feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False, index=True)
     title = Column(String(500), nullable=False)
     description = Column(Text)
     content = Column(Text)
@@ -15,10 +15,21 @@ class Article(Base):
     author = Column(String(100))
     published_date = Column(DateTime)
     base_score = Column(Float, default=0.0)  # Score from keyword matches
+    # Time-independent ranking key, see ArticleService.refresh_rank
+    rank_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    is_archived = Column(Boolean, nullable=False, default=False, server_default="0")  # Body moved to article_archives
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_articles_rank_score", "rank_score"),
+        Index("ix_articles_feed_rank_score", "feed_id", "rank_score"),
+    )
     
     # Relationships
     feed = relationship("Feed", back_populates="articles")
     keywords = relationship("ArticleKeyword", back_populates="article", cascade="all, delete-orphan")
     interactions = relationship("UserArticleInteraction", back_populates="article", cascade="all, delete-orphan")
+    saved_search_matches = relationship("SavedSearchMatch", back_populates="article", cascade="all, delete-orphan")
+    daily_reads = relationship("ArticleDailyRead", back_populates="article", cascade="all, delete-orphan")
+    archive = relationship("ArticleArchive", back_populates="article", uselist=False, cascade="all, delete-orphan")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+class ArticleArchive(Base):
+    """Compressed body of an archived article (see ArchiveService)"""
+    __tablename__ = "article_archives"
+
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zlib, zstd, or none when compression did not pay off
+    body = Column(LargeBinary, nullable=False)  # Compressed JSON: {"description": ..., "content": ...}
+    raw_size = Column(Integer, default=0)  # Bytes before compression
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    article = relationship("Article", back_populates="archive")
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class KeywordDailyStat(Base):
+    """Keyword matches per day, summed over the stored articles of that day (see StatsService)"""
+    __tablename__ = "keyword_daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Owner of the keyword
+    keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
+    day = Column(Date, nullable=False)  # Publication day of the articles (creation day when unknown)
+    match_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("keyword_id", "day", name="uq_keyword_daily_stats_keyword_day"),
+        Index("ix_keyword_daily_stats_user_day", "user_id", "day"),
+    )
+
+    # Relationships
+    keyword = relationship("Keyword", back_populates="daily_stats")
+
+class ArticleDailyRead(Base):
+    """Number of reads of an article per day (see StatsService)"""
+    __tablename__ = "article_daily_reads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Owner of the article's feed
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    day = Column(Date, nullable=False)  # Day the article was marked read
+    read_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("article_id", "day", name="uq_article_daily_reads_article_day"),
+        Index("ix_article_daily_reads_user_day", "user_id", "day"),
+    )
+
+    # Relationships
+    article = relationship("Article", back_populates="daily_reads")
@@ -16,6 +16,16 @@ class Feed(Base):
     autostarred = Column(Boolean, default=False)
     last_fetched = Column(DateTime)
     last_sync_status = Column(String(20), default="success")  # success, failed
+    etag = Column(String(255))  # HTTP validators from the last fetch, sent back as conditional GET
+    last_modified = Column(String(100))
+    next_sync_at = Column(DateTime, index=True)  # When the background scheduler polls this feed next
+    sync_interval = Column(Integer)  # Current adaptive polling interval in minutes
+    retention_days = Column(Integer)  # Age at which articles are purged, overrides the global setting (0 = keep forever)
+    # Cached counts for the feed list, recomputed by FeedService.refresh_counts when articles or interactions change
+    article_count = Column(Integer, nullable=False, default=0, server_default="0")
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    starred_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_sync_count = Column(Integer, nullable=False, default=0, server_default="0")  # New articles of the last sync
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -17,3 +17,4 @@ class Keyword(Base):
     # Relationships
     owner = relationship("User", back_populates="keywords")
     article_keywords = relationship("ArticleKeyword", back_populates="keyword", cascade="all, delete-orphan")
+    daily_stats = relationship("KeywordDailyStat", back_populates="keyword", cascade="all, delete-orphan")
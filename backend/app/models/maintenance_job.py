@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from datetime import datetime
+from app.database import Base
+
+class MaintenanceJob(Base):
+    __tablename__ = "maintenance_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False, default="rescore")  # rescore
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed, cancelled
+    checkpoint = Column(Integer, default=0)  # Last processed article id, the job resumes after it
+    processed = Column(Integer, default=0)
+    total = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    last_error = Column(Text)
+    cancel_requested = Column(Boolean, default=False)
+    created_by = Column(String(50))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Heartbeat while running
+    finished_at = Column(DateTime)
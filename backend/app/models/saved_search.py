@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=True)  # Restrict to one feed, NULL = all feeds
+    name = Column(String(100), nullable=False)
+    query = Column(String(500), nullable=False)  # Same syntax as article search
+    is_active = Column(Boolean, default=True)  # Inactive searches are not evaluated at ingest
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    owner = relationship("User", back_populates="saved_searches")
+    matches = relationship("SavedSearchMatch", back_populates="saved_search", cascade="all, delete-orphan")
+
+class SavedSearchMatch(Base):
+    __tablename__ = "saved_search_matches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id"), nullable=False)
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("saved_search_id", "article_id", name="uq_saved_search_matches_search_article"),
+    )
+    
+    # Relationships
+    saved_search = relationship("SavedSearch", back_populates="matches")
+    article = relationship("Article", back_populates="saved_search_matches")
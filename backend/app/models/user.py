@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from app.database import Base
 import bcrypt
@@ -9,17 +9,27 @@ class User(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True)
+    # Lowercased username, for case-insensitive lookups (and uniqueness) that can use an index
+    username_normalized = Column(String(50), unique=True, index=True)
     email = Column(String(100), unique=True, index=True)
     hashed_password = Column(String(255))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_admin = Column(Boolean, default=False)
+    # Bumped whenever something shown in the user's listings changes (see UserService.bump_data_version)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     feeds = relationship("Feed", back_populates="owner", cascade="all, delete-orphan")
     keywords = relationship("Keyword", back_populates="owner", cascade="all, delete-orphan")
     interactions = relationship("UserArticleInteraction", back_populates="user", cascade="all, delete-orphan")
+    saved_searches = relationship("SavedSearch", back_populates="owner", cascade="all, delete-orphan")
+    
+    @validates("username")
+    def _normalize_username(self, key, username):
+        self.username_normalized = username.lower() if username else username
+        return username
     
     def set_password(self, password: str):
         """Hash and set password"""
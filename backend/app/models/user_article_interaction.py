@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
+LIKE_SCORE_BOOST = 5.0  # Points added to an article's total score when liked
+
 class UserArticleInteraction(Base):
     __tablename__ = "user_article_interactions"
     
@@ -16,6 +18,11 @@ class UserArticleInteraction(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # One interaction per user and article; also the conflict target of bulk upserts
+        Index("ix_user_article_interactions_user_article", "user_id", "article_id", unique=True),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="interactions")
     article = relationship("Article", back_populates="interactions")
@@ -24,5 +31,5 @@ class UserArticleInteraction(Base):
         """Calculate total score boost from interactions"""
         boost = 0.0
         if self.is_liked:
-            boost += 5.0
+            boost += LIKE_SCORE_BOOST
         return boost
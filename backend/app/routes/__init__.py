@@ -4,5 +4,6 @@ from .keywords import router as keywords_router
 from .articles import router as articles_router
 from .config import router as config_router
 from .users import router as users_router
+from .saved_searches import router as saved_searches_router
 
-__all__ = ["auth_router", "feeds_router", "keywords_router", "articles_router", "config_router", "users_router"]
+__all__ = ["auth_router", "feeds_router", "keywords_router", "articles_router", "config_router", "users_router", "saved_searches_router"]
@@ -1,48 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from app.database import get_db
-from app.schemas.article import ArticleResponse, ArticleWithScores
+from app.schemas.article import (
+    ArticleResponse, ArticleWithScores, ArticleSearchResult, ARTICLE_SUMMARY_FIELDS, SEARCH_SUMMARY_FIELDS
+)
 from app.schemas.search import SearchRequest
-from app.models import Article, UserArticleInteraction, Feed
-from app.utils.auth import verify_token
-from app.services import UserService
-from app.services.article import ArticleService
-router = APIRouter(prefix="/articles", tags=["articles"])
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
-from app.schemas.article import ArticleResponse, ArticleWithScores
-from app.schemas.search import SearchRequest
-from app.models import Article, UserArticleInteraction, Feed
-from app.utils.auth import verify_token
+from app.schemas.interaction import UserArticleInteractionBatch
+from app.models import Article, Feed
+from app.models.user_article_interaction import LIKE_SCORE_BOOST
+from app.utils.auth import get_current_user
+from app.utils.fields import parse_fields, project
+from app.utils.fast_json import FastJSONResponse
+from app.utils.http_cache import check_not_modified
 from app.services import UserService
+from app.services.archive import ArchiveService
 from app.services.article import ArticleService
+from app.services.feed import FeedService
+from app.services.export import ExportService, EXPORT_FORMATS
+from app.services.interaction import InteractionService
+from app.services.read_marks import read_marks
+from app.services.statistics import StatsService
 router = APIRouter(prefix="/articles", tags=["articles"])
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
-    
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
-    
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    return user
+def decode_page_cursor(cursor: Optional[str], kind: str):
+    """Decode a pagination cursor into (sort key, ranking time), 400 if it is invalid"""
+    if not cursor:
+        return None, datetime.utcnow()
+    try:
+        after, now = ArticleService.decode_cursor(cursor, kind)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return after, now or datetime.utcnow()
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the cursor of the next page, if any"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+def select_fields(fields: Optional[str], model, presets=None) -> Optional[List[str]]:
+    """Parse a `fields` parameter against a response model, 400 on unknown names"""
+    try:
+        return parse_fields(fields, list(model.model_fields), presets)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+# Headers set on the dependency response that listing responses carry over
+LISTING_HEADERS = ("X-Next-Cursor", "ETag", "Cache-Control")
+
+def articles_response(items: List[dict], model, selected: Optional[List[str]], response: Response) -> FastJSONResponse:
+    """Serialize trusted service results as `model` (or its selected fields) without a validation pass"""
+    fields = selected or list(model.model_fields)
+    headers = {name: response.headers[name] for name in LISTING_HEADERS if name in response.headers}
+    return FastJSONResponse([project(item, fields, model) for item in items], headers=headers)
+
 @router.get("/count")
-def get_article_count(user = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_article_count(request: Request, response: Response,
+                      user = Depends(get_current_user), db: Session = Depends(get_db)):
     """Return total article count for current user"""
+    check_not_modified(request, response, db, user)
     feeds = db.query(Feed).filter(Feed.user_id == user.id).all()
     feed_ids = [f.id for f in feeds]
     count = db.query(Article).filter(Article.feed_id.in_(feed_ids)).count()
@@ -50,6 +69,8 @@ def get_article_count(user = Depends(get_current_user), db: Session = Depends(ge
 
 @router.get("/", response_model=List[ArticleWithScores])
 def list_articles(
+    request: Request,
+    response: Response,
     feed_id: int = Query(None),
     is_starred: bool = Query(None),
     is_read: bool = Query(None),
@@ -57,74 +78,77 @@ def list_articles(
     sort_by: str = Query("score", regex="^(score|date)$"),
     limit: int = Query(50),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
     user = Depends(get_current_user),
     db: Session = Depends(get_db)):
-    """Get articles with scores - sort by 'score' (default) or 'date'"""
-    
+    """Get articles with scores - sort by 'score' (default) or 'date'.
+
+    Full pages return an X-Next-Cursor header; pass it back as `cursor`
+    (instead of `offset`) to fetch the next page. `fields` is a
+    comma-separated list of response fields (or "summary") to return.
+    Responses carry an ETag; revalidate with If-None-Match to get a 304
+    while nothing changed.
+    """
+    check_not_modified(request, response, db, user, clock=True)
+    selected = select_fields(fields, ArticleWithScores, {"summary": ARTICLE_SUMMARY_FIELDS})
+    after, now = decode_page_cursor(cursor, sort_by)
     articles = ArticleService.get_articles_with_scores(
-        db, user.id, feed_id, is_starred, is_read, min_score, limit, offset, sort_by
+        db, user.id, feed_id, is_starred, is_read, min_score, limit, 0 if cursor else offset, sort_by,
+        after=after, now=now, fields=selected
     )
-    
-    return articles
+    set_next_cursor(response, ArticleService.next_cursor(articles, limit, sort_by, now))
+    return articles_response(articles, ArticleWithScores, selected, response)
 
-@router.get("/search")
+@router.get("/search", response_model=List[ArticleSearchResult])
 def search_articles(
+    request: Request,
+    response: Response,
     query: str = Query(...),
     feed_id: int = Query(None),
     min_score: float = Query(0.0),
     limit: int = Query(50),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None),
+    with_content: bool = Query(True),
+    fields: Optional[str] = Query(None),
     user = Depends(get_current_user),
     db: Session = Depends(get_db)):
-    """Search articles"""
-    
-    # Use the same logic as get_articles_with_scores to include scores and keywords
-    articles = ArticleService.search_articles(
-        db, user.id, query, feed_id, min_score, limit, offset
+    """Search articles, best matches first.
+
+    Each result has a relevance, the blended search_score it is sorted by and
+    a highlighted snippet; with_content=false leaves out article bodies.
+    `fields` selects response fields as for the article list.
+    Paginate with `offset`, or pass the X-Next-Cursor header back as `cursor`.
+    """
+    check_not_modified(request, response, db, user, clock=True)
+    selected = select_fields(fields, ArticleSearchResult, {"summary": SEARCH_SUMMARY_FIELDS})
+    after, _ = decode_page_cursor(cursor, "search")
+    results = ArticleService.search_articles(
+        db, user.id, query, feed_id, min_score, limit, 0 if cursor else offset, after=after,
+        with_content=with_content, fields=selected
     )
-    # For each article, build the same response as get_articles_with_scores
-    result = []
-    for article in articles:
-        # Force SQLAlchemy to load the keywords relationship
-        article.keywords
-        from app.models import UserArticleInteraction
-        interaction = db.query(UserArticleInteraction).filter(
-            UserArticleInteraction.article_id == article.id,
-            UserArticleInteraction.user_id == user.id
-        ).first()
-        user_boost = interaction.get_total_score_boost() if interaction else 0.0
-        total_score = article.base_score + user_boost
-        keywords_list = []
-        for ak in article.keywords:
-            keywords_list.append({
-                'id': ak.id,
-                'keyword_id': ak.keyword_id,
-                'keyword': ak.keyword.keyword if hasattr(ak.keyword, 'keyword') else str(ak.keyword),
-                'match_count': ak.match_count,
-                'points': ak.points
-            })
-        article_dict = {
-            'id': article.id,
-            'feed_id': article.feed_id,
-            'title': article.title,
-            'url': article.url,
-            'description': article.description,
-            'content': article.content,
-            'author': article.author,
-            'published_date': article.published_date,
-            'created_at': article.created_at,
-            'base_score': article.base_score,
-            'keywords': keywords_list,
-            'keyword_score': article.base_score,
-            'user_boost_score': user_boost,
-            'total_score': total_score,
-            'is_liked': interaction.is_liked if interaction else False,
-            'is_starred': interaction.is_starred if interaction else False
-        }
-        from app.schemas.article import ArticleWithScores
-        article_with_scores = ArticleWithScores(**article_dict)
-        result.append(article_with_scores)
-    return result
+    set_next_cursor(response, ArticleService.next_cursor(results, limit, "search"))
+    return articles_response(results, ArticleSearchResult, selected, response)
+
+@router.get("/export")
+def export_articles(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    feed_id: int = Query(None),
+    since: Optional[datetime] = Query(None),
+    with_content: bool = Query(False),
+    user = Depends(get_current_user)):
+    """Download all your articles with their scores and keyword hits as NDJSON or CSV.
+
+    The file is streamed as it is read from the database. `since` keeps
+    articles stored at or after that time (for incremental exports).
+    """
+    return StreamingResponse(
+        ExportService.stream(user.id, format, feed_id, since, with_content),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="articles.{format}"'}
+    )
+
 @router.delete("/{article_id}")
 def delete_article(article_id: int,
                   user = Depends(get_current_user),
@@ -140,76 +164,52 @@ def delete_article(article_id: int,
         if not feed or feed.user_id != user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this article")
 
+    StatsService.forget_articles(db, [article.id])
     db.delete(article)
+    db.flush()
+    FeedService.refresh_counts(db, [article.feed_id])
+    UserService.bump_data_version(db, [user.id])
     db.commit()
     return {"detail": "Article deleted"}
 
-@router.get("/", response_model=List[ArticleWithScores])
-def list_articles(
-    feed_id: int = Query(None),
-    is_starred: bool = Query(None),
-    is_read: bool = Query(None),
-    min_score: float = Query(0.0),
-    sort_by: str = Query("score", regex="^(score|date)$"),
-    limit: int = Query(50),
-    offset: int = Query(0),
-    user = Depends(get_current_user),
-    db: Session = Depends(get_db)):
-    """Get articles with scores - sort by 'score' (default) or 'date'"""
-    
-    articles = ArticleService.get_articles_with_scores(
-        db, user.id, feed_id, is_starred, is_read, min_score, limit, offset, sort_by
-    )
-    
-    return articles
+@router.post("/interactions/")
+def update_interactions(batch: UserArticleInteractionBatch,
+                        user = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    """Set read/star/like flags on many articles at once.
 
-@router.get("/search")
-def search_articles(
-    query: str = Query(...),
-    feed_id: int = Query(None),
-    min_score: float = Query(0.0),
-    limit: int = Query(50),
-    offset: int = Query(0),
-    user = Depends(get_current_user),
-    db: Session = Depends(get_db)):
-    """Search articles"""
-    
-    articles = ArticleService.search_articles(
-        db, user.id, query, feed_id, min_score, limit, offset
+    Applies to the listed `article_ids`, or to all your articles matching
+    `feed_id`, `older_than` and `min_score` (all of them when no filter is
+    given, e.g. "mark all as read"). Flags left out are not changed.
+    """
+    changes = {"is_read": batch.is_read, "is_starred": batch.is_starred, "is_liked": batch.is_liked}
+    if all(value is None for value in changes.values()):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No interaction to apply")
+    articles = InteractionService.select_articles(
+        db, user.id, batch.article_ids, batch.feed_id, batch.older_than, batch.min_score
     )
-    
-    return articles
+    updated = InteractionService.apply(db, user.id, articles, changes)
+    db.commit()
+    return {"updated": updated}
 
 @router.get("/{article_id}", response_model=ArticleResponse)
 def get_article(article_id: int,
                 user = Depends(get_current_user),
                 db: Session = Depends(get_db)):
-    """Get a specific article"""
+    """Get a specific article (archived bodies are decompressed here)"""
     
     article = db.query(Article).filter(Article.id == article_id).first()
     
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
-    # Mark as read
-    interaction = db.query(UserArticleInteraction).filter(
-        UserArticleInteraction.user_id == user.id,
-        UserArticleInteraction.article_id == article_id
-    ).first()
+    # Mark as read: queued and written in batches, the request itself stays read-only
+    read_marks.add(user.id, article_id)
     
-    if not interaction:
-        interaction = UserArticleInteraction(
-            user_id=user.id,
-            article_id=article_id,
-            is_read=True
-        )
-        db.add(interaction)
-    else:
-        interaction.is_read = True
-    
-    db.commit()
-    
-    return article
+    result = ArticleResponse.model_validate(article)
+    if article.is_archived:
+        result = result.model_copy(update=ArchiveService.bodies(db, [article.id]).get(article.id, {}))
+    return result
 
 @router.post("/{article_id}/like/")
 def like_article(article_id: int,
@@ -221,26 +221,10 @@ def like_article(article_id: int,
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
-    interaction = db.query(UserArticleInteraction).filter(
-        UserArticleInteraction.user_id == user.id,
-        UserArticleInteraction.article_id == article_id
-    ).first()
-    
-    if not interaction:
-        interaction = UserArticleInteraction(
-            user_id=user.id,
-            article_id=article_id,
-            is_liked=True,
-            user_score_boost=5.0
-        )
-        db.add(interaction)
-    else:
-        interaction.is_liked = True
-        interaction.user_score_boost = interaction.get_total_score_boost()
-    
+    InteractionService.apply(db, user.id, select(Article.id).where(Article.id == article_id), {"is_liked": True})
     db.commit()
     
-    return {"detail": "Article liked", "boost": 5.0}
+    return {"detail": "Article liked", "boost": LIKE_SCORE_BOOST}
 
 @router.post("/{article_id}/unlike/")
 def unlike_article(article_id: int,
@@ -248,15 +232,8 @@ def unlike_article(article_id: int,
                    db: Session = Depends(get_db)):
     """Unlike an article"""
     
-    interaction = db.query(UserArticleInteraction).filter(
-        UserArticleInteraction.user_id == user.id,
-        UserArticleInteraction.article_id == article_id
-    ).first()
-    
-    if interaction:
-        interaction.is_liked = False
-        interaction.user_score_boost = interaction.get_total_score_boost()
-        db.commit()
+    InteractionService.apply(db, user.id, select(Article.id).where(Article.id == article_id), {"is_liked": False})
+    db.commit()
     
     return {"detail": "Article unliked"}
 
@@ -270,21 +247,7 @@ def star_article(article_id: int,
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
-    interaction = db.query(UserArticleInteraction).filter(
-        UserArticleInteraction.user_id == user.id,
-        UserArticleInteraction.article_id == article_id
-    ).first()
-    
-    if not interaction:
-        interaction = UserArticleInteraction(
-            user_id=user.id,
-            article_id=article_id,
-            is_starred=True
-        )
-        db.add(interaction)
-    else:
-        interaction.is_starred = True
-    
+    InteractionService.apply(db, user.id, select(Article.id).where(Article.id == article_id), {"is_starred": True})
     db.commit()
     
     return {"detail": "Article starred"}
@@ -295,13 +258,7 @@ def unstar_article(article_id: int,
                    db: Session = Depends(get_db)):
     """Unstar an article"""
     
-    interaction = db.query(UserArticleInteraction).filter(
-        UserArticleInteraction.user_id == user.id,
-        UserArticleInteraction.article_id == article_id
-    ).first()
-    
-    if interaction:
-        interaction.is_starred = False
-        db.commit()
+    InteractionService.apply(db, user.id, select(Article.id).where(Article.id == article_id), {"is_starred": False})
+    db.commit()
     
     return {"detail": "Article unstarred"}
@@ -5,7 +5,7 @@ from typing import Optional
 from app.database import get_db
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.services import UserService
-from app.utils.auth import create_access_token, verify_token
+from app.utils.auth import create_access_token, verify_token, get_current_user
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -79,20 +79,6 @@ def refresh_token(authorization: Optional[str] = Header(None)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def get_current_user_info(user = Depends(get_current_user)):
     """Return current user information from token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
-
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
     return user
@@ -1,35 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from app.database import get_db
 from app.schemas.feed import FeedCreate, FeedResponse, FeedUpdate
-from app.models import Feed
-from app.utils.auth import verify_token
-from app.services.article import ArticleService
-from app.scrapers import RSSFeedReader, WebScraper
+from app.models import Article, Feed
+from app.utils.auth import get_current_user
+from app.utils.fields import project
+from app.utils.fast_json import FastJSONResponse
+from app.utils.http_cache import check_not_modified
+from app.services import UserService
+from app.services.feed import FeedService, FeedSyncError
+from app.services.statistics import StatsService
 
 router = APIRouter(prefix="/feeds", tags=["feeds"])
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
-    from app.services import UserService
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
-    
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
-    
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    return user
+# Feeds not synced successfully for this many days are reported as stale / broken
+STALE_DAYS = 3
+BROKEN_DAYS = 7
+
+def feed_health(feed: Feed, now: datetime) -> str:
+    """Health of a feed from its last sync: healthy, stale or broken"""
+    # Immediate error if last sync failed
+    if feed.last_sync_status == 'failed' or not feed.last_fetched:
+        return 'broken'
+    days_since = (now - feed.last_fetched).days
+    if days_since >= BROKEN_DAYS:
+        return 'broken'
+    if days_since >= STALE_DAYS:
+        return 'stale'
+    return 'healthy'
+
+def feed_response(feed: Feed, now: Optional[datetime] = None) -> dict:
+    """FeedResponse fields of a feed; counts come from the columns kept by FeedService.refresh_counts"""
+    feed_dict = {name: getattr(feed, name) for name in FeedResponse.model_fields if name != 'health'}
+    feed_dict['health'] = feed_health(feed, now or datetime.utcnow())
+    return feed_dict
 
 @router.post("/", response_model=FeedResponse)
 def create_feed(feed_data: FeedCreate, 
@@ -43,51 +50,30 @@ def create_feed(feed_data: FeedCreate,
         url=feed_data.url,
         feed_type=feed_data.feed_type,
         description=feed_data.description,
-        autostarred=feed_data.autostarred if hasattr(feed_data, 'autostarred') else False
+        autostarred=feed_data.autostarred if hasattr(feed_data, 'autostarred') else False,
+        retention_days=feed_data.retention_days
     )
     db.add(db_feed)
+    UserService.bump_data_version(db, [user.id])
     db.commit()
     db.refresh(db_feed)
-    # Return a dict with article_count=0 for FeedResponse
-    feed_dict = db_feed.__dict__.copy()
-    feed_dict['article_count'] = 0
-    return feed_dict
+    return feed_response(db_feed)
 
 @router.get("/", response_model=List[FeedResponse])
-def list_feeds(user = Depends(get_current_user),
+def list_feeds(request: Request,
+               response: Response,
+               user = Depends(get_current_user),
                db: Session = Depends(get_db)):
-    """Get all feeds for current user"""
+    """Get all feeds for current user, with their article, unread and starred counts"""
     
+    # Feed health is derived from the clock too
+    check_not_modified(request, response, db, user, clock=True)
     feeds = db.query(Feed).filter(Feed.user_id == user.id).all()
-    # For each feed, add article_count
-    result = []
-    import datetime
-    now = datetime.datetime.utcnow()
-    STALE_DAYS = 3
-    BROKEN_DAYS = 7
-    for feed in feeds:
-        article_count = db.query(Feed).filter(Feed.id == feed.id).first().articles
-        count = len(article_count) if article_count else 0
-        feed_dict = feed.__dict__.copy()
-        feed_dict['article_count'] = count
-        # Feed health logic
-        last_fetched = feed.last_fetched
-        # Immediate error if last sync failed
-        if hasattr(feed, 'last_sync_status') and feed.last_sync_status == 'failed':
-            health = 'broken'
-        elif not last_fetched:
-            health = 'broken'
-        else:
-            days_since = (now - last_fetched).days
-            if days_since >= BROKEN_DAYS:
-                health = 'broken'
-            elif days_since >= STALE_DAYS:
-                health = 'stale'
-            else:
-                health = 'healthy'
-        feed_dict['health'] = health
-        result.append(feed_dict)
-    return result
+    now = datetime.utcnow()
+    # Trusted ORM data: serialize with the FeedResponse fields, without a validation pass
+    fields = list(FeedResponse.model_fields)
+    return FastJSONResponse([project(feed_response(feed, now), fields, FeedResponse) for feed in feeds],
+                            headers={"ETag": response.headers["ETag"], "Cache-Control": response.headers["Cache-Control"]})
 
 @router.get("/{feed_id}", response_model=FeedResponse)
 def get_feed(feed_id: int,
@@ -103,7 +89,7 @@ def get_feed(feed_id: int,
     if not feed:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
     
-    return feed
+    return feed_response(feed)
 
 @router.put("/{feed_id}", response_model=FeedResponse)
 def update_feed(feed_id: int,
@@ -123,6 +109,9 @@ def update_feed(feed_id: int,
     if feed_data.name:
         feed.name = feed_data.name
     if feed_data.url:
+        if feed_data.url != feed.url:
+            feed.etag = None
+            feed.last_modified = None
         feed.url = feed_data.url
     if feed_data.description is not None:
         feed.description = feed_data.description
@@ -130,21 +119,18 @@ def update_feed(feed_id: int,
         feed.is_active = feed_data.is_active
     if feed_data.autostarred is not None:
         feed.autostarred = feed_data.autostarred
+    if "retention_days" in feed_data.model_fields_set:
+        feed.retention_days = feed_data.retention_days
     if feed_data.last_fetched is not None:
         feed.last_fetched = feed_data.last_fetched
+        # Resetting the sync point must re-download the full feed
+        feed.etag = None
+        feed.last_modified = None
     
+    UserService.bump_data_version(db, [user.id])
     db.commit()
     db.refresh(feed)
-    # Compose response dict with required fields
-    feed_dict = feed.__dict__.copy()
-    # Compute article_count
-    article_count = db.query(Feed).filter(Feed.id == feed.id).first().articles
-    count = len(article_count) if article_count else 0
-    feed_dict['article_count'] = count
-    # Ensure last_sync_status is present
-    if 'last_sync_status' not in feed_dict:
-        feed_dict['last_sync_status'] = None
-    return feed_dict
+    return feed_response(feed)
 
 @router.delete("/{feed_id}")
 def delete_feed(feed_id: int,
@@ -160,7 +146,9 @@ def delete_feed(feed_id: int,
     if not feed:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
     
+    StatsService.forget_articles(db, select(Article.id).where(Article.feed_id == feed.id))
     db.delete(feed)
+    UserService.bump_data_version(db, [user.id])
     db.commit()
     
     return {"detail": "Feed deleted"}
@@ -179,61 +167,26 @@ def sync_feed(feed_id: int,
     if not feed:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
     
-    count = 0
-    
     try:
-        if feed.feed_type == "rss":
-            result = RSSFeedReader.fetch_feed(feed.url)
-            if not result or not result.get("articles"):
-                feed.last_sync_status = "failed"
-                db.commit()
-                raise HTTPException(status_code=400, detail="Feed is unreachable, invalid, or contains no articles.")
-            last_fetched = feed.last_fetched
-            if last_fetched is not None and last_fetched.tzinfo is not None:
-                # Convert last_fetched to naive UTC
-                last_fetched = last_fetched.replace(tzinfo=None)
-            for article_data in result["articles"]:
-                pub_date = article_data.get("published_date")
-                if pub_date is not None and hasattr(pub_date, 'tzinfo') and pub_date.tzinfo is not None:
-                    # Convert pub_date to naive UTC
-                    pub_date = pub_date.replace(tzinfo=None)
-                # Only add if published_date is newer than last_fetched (or if last_fetched is None)
-                if last_fetched is not None and pub_date is not None:
-                    if pub_date <= last_fetched:
-                        continue
-                article = ArticleService.create_article(
-                    db,
-                    feed.id,
-                    article_data["title"],
-                    article_data["url"],
-                    article_data["description"],
-                    article_data["content"],
-                    article_data["author"],
-                    pub_date
-                )
-                ArticleService.score_article(db, article, user.id)
-                count += 1
-        elif feed.feed_type == "scraper":
-            result = WebScraper.scrape_page(feed.url)
-            if result:
-                article = ArticleService.create_article(
-                    db,
-                    feed.id,
-                    result["title"],
-                    result["url"],
-                    result["description"],
-                    result["content"]
-                )
-                ArticleService.score_article(db, article, user.id)
-                count = 1
-        feed.last_fetched = __import__('datetime').datetime.utcnow()
-        feed.last_sync_status = "success"
-        db.commit()
-        return {"detail": f"Synced {count} articles"}
-    except Exception as e:
-        feed.last_sync_status = "failed"
-        db.commit()
-        raise
+        count = FeedService.sync_feed(db, feed)
+    except FeedSyncError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"detail": f"Synced {count} articles"}
+
+@router.post("/sync_all/")
+def sync_all_feeds(max_workers: Optional[int] = Query(None, ge=1, le=64),
+                   user = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    """Sync all active feeds of the current user in parallel"""
+    
+    feeds = db.query(Feed).filter(
+        Feed.user_id == user.id,
+        Feed.is_active == True
+    ).all()
+    summaries = FeedService.sync_feeds(db, feeds, max_workers)
+    synced = sum(s["synced"] for s in summaries)
+    failed = sum(1 for s in summaries if s["status"] == "failed")
+    return {"detail": f"Synced {synced} articles from {len(summaries)} feeds ({failed} failed)", "feeds": summaries}
 
 from fastapi import UploadFile, File
 import xml.etree.ElementTree as ET
@@ -287,5 +240,7 @@ async def import_opml(file: UploadFile = File(...), user = Depends(get_current_u
             )
             db.add(db_feed)
             imported += 1
+    if imported:
+        UserService.bump_data_version(db, [user.id])
     db.commit()
     return {"imported": imported}
@@ -1,34 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.schemas.keyword import KeywordCreate, KeywordResponse, KeywordUpdate
 from app.models import Keyword
-from app.utils.auth import verify_token
+from app.utils.auth import get_current_user
 from app.services import UserService
+from app.services.article import ArticleService
+from app.utils.scoring import invalidate_keyword_matcher
+from app.utils.http_cache import check_not_modified
 
 router = APIRouter(prefix="/keywords", tags=["keywords"])
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
-    
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
-    
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
-    
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    
-    return user
-
 @router.post("/", response_model=KeywordResponse)
 def create_keyword(keyword_data: KeywordCreate,
                    user = Depends(get_current_user),
@@ -43,14 +26,23 @@ def create_keyword(keyword_data: KeywordCreate,
     db.add(db_keyword)
     db.commit()
     db.refresh(db_keyword)
+    invalidate_keyword_matcher(user.id)
+    # Score the existing articles against the new keyword only
+    ArticleService.rescore_keyword(db, user.id, db_keyword)
+    UserService.bump_data_version(db, [user.id])
+    db.commit()
+    db.refresh(db_keyword)
     
     return db_keyword
 
 @router.get("/", response_model=List[KeywordResponse])
-def list_keywords(user = Depends(get_current_user),
+def list_keywords(request: Request,
+                  response: Response,
+                  user = Depends(get_current_user),
                   db: Session = Depends(get_db)):
     """Get all keywords for current user"""
     
+    check_not_modified(request, response, db, user)
     keywords = db.query(Keyword).filter(Keyword.user_id == user.id).all()
     return keywords
 
@@ -69,6 +61,7 @@ def update_keyword(keyword_id: int,
     if not keyword:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Keyword not found")
     
+    previous = (keyword.keyword, keyword.weight, keyword.is_active)
     if keyword_data.keyword:
         keyword.keyword = keyword_data.keyword
     if keyword_data.weight is not None:
@@ -76,8 +69,14 @@ def update_keyword(keyword_id: int,
     if keyword_data.is_active is not None:
         keyword.is_active = keyword_data.is_active
     
+    if (keyword.keyword, keyword.weight, keyword.is_active) != previous:
+        # Only re-scan article text when the term itself changed or it was re-enabled
+        rematch = keyword.keyword != previous[0] or (keyword.is_active and not previous[2])
+        ArticleService.rescore_keyword(db, user.id, keyword, rematch=rematch)
+        UserService.bump_data_version(db, [user.id])
     db.commit()
     db.refresh(keyword)
+    invalidate_keyword_matcher(user.id)
     
     return keyword
 
@@ -95,7 +94,10 @@ def delete_keyword(keyword_id: int,
     if not keyword:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Keyword not found")
     
+    ArticleService.rescore_keyword(db, user.id, keyword, removed=True)
     db.delete(keyword)
+    UserService.bump_data_version(db, [user.id])
     db.commit()
+    invalidate_keyword_matcher(user.id)
     
     return {"detail": "Keyword deleted"}
@@ -1,87 +1,155 @@
 
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from app.database import get_db
-from app.services.article import ArticleService
-from app.models import User, Feed, Article
-from app.utils.auth import verify_token
+from app.database import engine, get_db
+from app.services.archive import ArchiveService
+from app.services.feed import FeedService
+from app.services.purge import PurgeService
+from app.services.rescore import RescoreService
+from app.services.search import SearchIndex
+from app.services.statistics import StatsService
+from app.models import User, Feed, MaintenanceJob
+from app.schemas.maintenance_job import MaintenanceJobResponse
+from app.utils.auth import get_current_user
 from app.config import settings
 
 router = APIRouter(prefix="/maintenance", tags=["maintenance"])
 
-# Place purge endpoint after router is defined
 @router.post("/purge/")
-def purge_old_articles(days: int = 30, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """Purge articles older than the specified number of days."""
+def purge_old_articles(days: int = Query(30, ge=1), keep_starred: Optional[bool] = None,
+                       authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Purge articles older than the specified number of days (or their feed's retention_days).
+
+    Starred articles are kept unless keep_starred=false (default: settings.purge_keep_starred).
+    """
+    require_maintenance_admin(authorization, db)
+    return PurgeService.purge(db, days, keep_starred)
+
+
+def require_maintenance_admin(authorization: Optional[str], db: Session) -> User:
+    """Return the current user if allowed to run maintenance (admin users or debug mode)"""
     user = get_current_user(authorization=authorization, db=db)
     allowed_admins: List[str] = settings.admin_users or []
     if (not settings.debug) and (user.username not in allowed_admins):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to run maintenance")
+    return user
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    # Only delete if published_date is older than cutoff
-    old_articles = db.query(Article).filter(Article.published_date != None, Article.published_date < cutoff).all()
-    # For legacy: only delete if published_date is NULL and created_at is older than cutoff
-    legacy_articles = db.query(Article).filter(Article.published_date == None, Article.created_at < cutoff).all()
-    purged_count = 0
-    for article in old_articles + legacy_articles:
-        db.delete(article)
-        purged_count += 1
-    db.commit()
-    return {"purged_articles": purged_count}
 
+def get_job_or_404(db: Session, job_id: int) -> MaintenanceJob:
+    job = db.query(MaintenanceJob).filter(MaintenanceJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> User:
-    """Get current user from JWT token"""
-    from app.services import UserService
 
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+@router.post("/rescore/", response_model=MaintenanceJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def rescore_all(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Start a background job rescoring all articles for all users.
 
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
+    Protected: only callable by configured admin users in settings.admin_users or when debug=True.
+    Returns the job (the running one if a rescore is already in progress); follow it with
+    GET /maintenance/jobs/{job_id}.
+    """
+    user = require_maintenance_admin(authorization, db)
+    return RescoreService.start_job(db, created_by=user.username)
 
-    if not payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
+@router.get("/jobs/", response_model=List[MaintenanceJobResponse])
+def list_jobs(limit: int = 20, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """List the most recent maintenance jobs"""
+    require_maintenance_admin(authorization, db)
+    return db.query(MaintenanceJob).order_by(MaintenanceJob.id.desc()).limit(limit).all()
 
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    return user
+@router.get("/jobs/{job_id}", response_model=MaintenanceJobResponse)
+def get_job(job_id: int, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Get the progress of a maintenance job"""
+    require_maintenance_admin(authorization, db)
+    return get_job_or_404(db, job_id)
 
 
-@router.post("/rescore/")
-def rescore_all(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """Rescore all articles for all users.
+@router.post("/jobs/{job_id}/cancel/", response_model=MaintenanceJobResponse)
+def cancel_job(job_id: int, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Ask a pending or running job to stop after its current chunk"""
+    require_maintenance_admin(authorization, db)
+    job = get_job_or_404(db, job_id)
+    if job.status in ("pending", "running"):
+        job.cancel_requested = True
+    elif job.status == "failed":
+        job.status = "cancelled"
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@router.post("/jobs/{job_id}/resume/", response_model=MaintenanceJobResponse)
+def resume_job(job_id: int, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Resume a failed or cancelled job from its checkpoint"""
+    require_maintenance_admin(authorization, db)
+    job = get_job_or_404(db, job_id)
+    if job.status not in ("failed", "cancelled"):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    job.status = "pending"
+    job.cancel_requested = False
+    db.commit()
+    RescoreService.launch(job.id)
+    db.refresh(job)
+    return job
+
+
+@router.post("/sync_all/")
+def sync_all_users(max_workers: Optional[int] = Query(None, ge=1, le=64),
+                   authorization: Optional[str] = Header(None),
+                   db: Session = Depends(get_db)):
+    """Sync every active feed of every user in parallel.
 
     Protected: only callable by configured admin users in settings.admin_users or when debug=True.
-    Returns number of articles rescored and any errors encountered.
+    Returns a per-feed summary.
     """
-    # Validate user and admin rights
-    user = get_current_user(authorization=authorization, db=db)
+    require_maintenance_admin(authorization, db)
+    feeds = db.query(Feed).filter(Feed.is_active == True).order_by(Feed.user_id, Feed.id).all()
+    summaries = FeedService.sync_feeds(db, feeds, max_workers)
+    return {
+        "synced_feeds": len(summaries),
+        "synced_articles": sum(s["synced"] for s in summaries),
+        "failed_feeds": sum(1 for s in summaries if s["status"] == "failed"),
+        "feeds": summaries,
+    }
+
+
+@router.post("/search_index/rebuild/")
+def rebuild_search_index(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Rebuild the full-text search index from the articles table (admin only)."""
+    require_maintenance_admin(authorization, db)
+    SearchIndex.rebuild(db)
+    return {"backend": SearchIndex.backend or "like"}
+
+
+@router.post("/statistics/rebuild/")
+def rebuild_statistics(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Recompute the daily statistics rollups from articles and interactions (admin only)."""
+    require_maintenance_admin(authorization, db)
+    counts = StatsService.rebuild(db)
+    db.commit()
+    return counts
 
-    allowed_admins: List[str] = settings.admin_users or []
-    if (not settings.debug) and (user.username not in allowed_admins):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to run maintenance")
 
-    total = 0
-    errors = []
-
-    users = db.query(User).all()
-    for u in users:
-        feeds = db.query(Feed).filter(Feed.user_id == u.id).all()
-        for f in feeds:
-            articles = db.query(Article).filter(Article.feed_id == f.id).all()
-            for a in articles:
-                try:
-                    ArticleService.score_article(db, a, u.id)
-                    total += 1
-                except Exception as e:
-                    errors.append({"article_id": a.id, "error": str(e)})
-
-    return {"rescored_articles": total, "errors": errors}
+@router.post("/archive/")
+def archive_old_articles(days: int = Query(..., ge=1), authorization: Optional[str] = Header(None),
+                         db: Session = Depends(get_db)):
+    """Move the bodies of articles older than `days` to compressed cold storage (admin only)."""
+    require_maintenance_admin(authorization, db)
+    return ArchiveService.archive(db, days)
+
+
+@router.post("/vacuum/")
+def vacuum_database(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Compact the SQLite database with a full VACUUM (admin only).
+
+    Also switches databases created before incremental auto-vacuum to it,
+    so later purges shrink the file.
+    """
+    require_maintenance_admin(authorization, db)
+    db.close()
+    return PurgeService.vacuum(engine)
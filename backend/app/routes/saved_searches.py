@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_db
+from app.schemas.article import ArticleWithScores, ARTICLE_SUMMARY_FIELDS
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchResponse, SavedSearchUpdate
+from app.models import Feed, SavedSearch, SavedSearchMatch
+from app.utils.auth import get_current_user
+from app.utils.search_query import parse_query
+from app.services.article import ArticleService
+from app.services.saved_search import SavedSearchService
+from app.routes.articles import decode_page_cursor, set_next_cursor, select_fields, articles_response
+
+router = APIRouter(prefix="/saved_searches", tags=["saved_searches"])
+
+def get_saved_search_or_404(db: Session, user_id: int, saved_search_id: int) -> SavedSearch:
+    saved_search = db.query(SavedSearch).filter(
+        SavedSearch.id == saved_search_id,
+        SavedSearch.user_id == user_id
+    ).first()
+    if not saved_search:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found")
+    return saved_search
+
+def validate_search(db: Session, user_id: int, query: str, feed_id: Optional[int]):
+    if parse_query(query) is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query contains no search terms")
+    if feed_id and not db.query(Feed.id).filter(Feed.id == feed_id, Feed.user_id == user_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found")
+
+def to_response(saved_search: SavedSearch, match_count: int) -> SavedSearchResponse:
+    response = SavedSearchResponse.model_validate(saved_search)
+    response.match_count = match_count
+    return response
+
+@router.post("/", response_model=SavedSearchResponse)
+def create_saved_search(data: SavedSearchCreate,
+                        user = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    """Save a search query; existing matching articles are recorded right away"""
+    
+    validate_search(db, user.id, data.query, data.feed_id)
+    saved_search = SavedSearch(user_id=user.id, name=data.name, query=data.query, feed_id=data.feed_id)
+    db.add(saved_search)
+    db.flush()
+    match_count = SavedSearchService.backfill(db, saved_search)
+    db.commit()
+    db.refresh(saved_search)
+    
+    return to_response(saved_search, match_count)
+
+@router.get("/", response_model=List[SavedSearchResponse])
+def list_saved_searches(user = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    """Get all saved searches for current user"""
+    
+    saved_searches = db.query(SavedSearch).filter(SavedSearch.user_id == user.id).order_by(SavedSearch.name).all()
+    counts = SavedSearchService.match_counts(db, [s.id for s in saved_searches])
+    return [to_response(s, counts.get(s.id, 0)) for s in saved_searches]
+
+@router.put("/{saved_search_id}", response_model=SavedSearchResponse)
+def update_saved_search(saved_search_id: int,
+                        data: SavedSearchUpdate,
+                        user = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    """Update a saved search; its matches are recomputed when the query, feed or activation changes"""
+    
+    saved_search = get_saved_search_or_404(db, user.id, saved_search_id)
+    previous = (saved_search.query, saved_search.feed_id, saved_search.is_active)
+    if data.name:
+        saved_search.name = data.name
+    if data.query:
+        saved_search.query = data.query
+    if "feed_id" in data.model_fields_set:
+        saved_search.feed_id = data.feed_id
+    if data.is_active is not None:
+        saved_search.is_active = data.is_active
+    validate_search(db, user.id, saved_search.query, saved_search.feed_id)
+    
+    current = (saved_search.query, saved_search.feed_id, saved_search.is_active)
+    if current != previous and saved_search.is_active:
+        SavedSearchService.backfill(db, saved_search)
+    db.commit()
+    db.refresh(saved_search)
+    
+    return to_response(saved_search, SavedSearchService.match_counts(db, [saved_search.id]).get(saved_search.id, 0))
+
+@router.delete("/{saved_search_id}")
+def delete_saved_search(saved_search_id: int,
+                        user = Depends(get_current_user),
+                        db: Session = Depends(get_db)):
+    """Delete a saved search and its recorded matches"""
+    
+    saved_search = get_saved_search_or_404(db, user.id, saved_search_id)
+    db.execute(delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == saved_search.id))
+    db.delete(saved_search)
+    db.commit()
+    
+    return {"detail": "Saved search deleted"}
+
+@router.get("/{saved_search_id}/articles", response_model=List[ArticleWithScores])
+def list_saved_search_articles(
+    saved_search_id: int,
+    response: Response,
+    is_starred: bool = Query(None),
+    is_read: bool = Query(None),
+    min_score: float = Query(0.0),
+    sort_by: str = Query("score", regex="^(score|date)$"),
+    limit: int = Query(50),
+    offset: int = Query(0),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+    user = Depends(get_current_user),
+    db: Session = Depends(get_db)):
+    """Articles matching a saved search, read from the recorded matches (same paging and fields as /articles)"""
+    
+    saved_search = get_saved_search_or_404(db, user.id, saved_search_id)
+    selected = select_fields(fields, ArticleWithScores, {"summary": ARTICLE_SUMMARY_FIELDS})
+    after, now = decode_page_cursor(cursor, sort_by)
+    articles = ArticleService.get_articles_with_scores(
+        db, user.id, None, is_starred, is_read, min_score, limit, 0 if cursor else offset, sort_by,
+        after=after, now=now, saved_search_id=saved_search.id, fields=selected
+    )
+    set_next_cursor(response, ArticleService.next_cursor(articles, limit, sort_by, now))
+    return articles_response(articles, ArticleWithScores, selected, response)
@@ -1,69 +1,86 @@
-from fastapi import APIRouter, Depends, status, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import func
 from typing import List, Optional
+from datetime import date
 from app.database import get_db
-from app.models import Article, UserArticleInteraction, ArticleKeyword, Keyword, Feed
-from app.utils.auth import verify_token
-from app.services import UserService
+from app.models import Article, ArticleDailyRead, Keyword, KeywordDailyStat
+from app.utils.auth import get_optional_user
+from app.utils.fields import parse_fields, project
 
 router = APIRouter(prefix="/statistics", tags=["statistics"])
 
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    if not authorization or not authorization.startswith("Bearer "):
-        return None
-    token = authorization.replace("Bearer ", "")
-    payload = verify_token(token)
-    if not payload:
-        return None
-    username = payload.get("sub")
-    user = UserService.get_user_by_username(db, username)
-    return user
+MOST_READ_FIELDS = ["id", "title", "url", "read_count"]
+KEYWORD_TREND_FIELDS = ["keyword", "total_matches"]
+
+def select_fields(fields: Optional[str], allowed: List[str]) -> List[str]:
+    """Parse a `fields` parameter (comma-separated), 400 on unknown names"""
+    try:
+        return parse_fields(fields, allowed) or allowed
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def in_window(day_column, since: Optional[date], until: Optional[date]) -> list:
+    """Filters keeping the rollup days between since and until (both inclusive)"""
+    filters = []
+    if since is not None:
+        filters.append(day_column >= since)
+    if until is not None:
+        filters.append(day_column <= until)
+    return filters
 
 @router.get("/most_read_articles")
-def most_read_articles(limit: int = 5, user = Depends(get_current_user), db: Session = Depends(get_db)):
+def most_read_articles(limit: int = 5, fields: Optional[str] = Query(None),
+                       since: Optional[date] = Query(None), until: Optional[date] = Query(None),
+                       user = Depends(get_optional_user), db: Session = Depends(get_db)):
+    """Most read articles (of the user's feeds, or all feeds when anonymous) read between since and until"""
+    selected = select_fields(fields, MOST_READ_FIELDS)
+    reads = (
+        db.query(ArticleDailyRead.article_id, func.sum(ArticleDailyRead.read_count).label("read_count"))
+        .filter(*in_window(ArticleDailyRead.day, since, until))
+        .group_by(ArticleDailyRead.article_id)
+    )
     if user:
-        feeds = db.query(Feed).filter(Feed.user_id == user.id).all()
-        feed_ids = [f.id for f in feeds]
-    else:
-        feed_ids = db.query(Feed.id).all()
-        feed_ids = [f[0] for f in feed_ids]
+        reads = reads.filter(ArticleDailyRead.user_id == user.id)
+    reads = reads.subquery()
     results = (
-        db.query(Article, func.count(UserArticleInteraction.id).label("read_count"))
-        .join(UserArticleInteraction, Article.id == UserArticleInteraction.article_id)
-        .filter(Article.feed_id.in_(feed_ids), UserArticleInteraction.is_read == True)
-        .group_by(Article.id)
-        .order_by(func.count(UserArticleInteraction.id).desc())
+        db.query(Article, reads.c.read_count)
+        .options(load_only(Article.id, *[getattr(Article, name) for name in ("title", "url") if name in selected]))
+        .join(reads, reads.c.article_id == Article.id)
+        .filter(reads.c.read_count > 0)
+        .order_by(reads.c.read_count.desc(), Article.id)
         .limit(limit)
         .all()
     )
     return [
-        {
+        project({
             "id": a.id,
-            "title": a.title,
-            "url": a.url,
+            "title": a.title if "title" in selected else None,
+            "url": a.url if "url" in selected else None,
             "read_count": read_count
-        } for a, read_count in results
+        }, selected) for a, read_count in results
     ]
 
 @router.get("/keyword_trends")
-def keyword_trends(limit: int = 5, user = Depends(get_current_user), db: Session = Depends(get_db)):
+def keyword_trends(limit: int = 5, fields: Optional[str] = Query(None),
+                   since: Optional[date] = Query(None), until: Optional[date] = Query(None),
+                   user = Depends(get_optional_user), db: Session = Depends(get_db)):
+    """Keywords with the most matches in articles published between since and until"""
+    selected = select_fields(fields, KEYWORD_TREND_FIELDS)
+    results = (
+        db.query(Keyword.keyword, func.sum(KeywordDailyStat.match_count).label("total_matches"))
+        .join(KeywordDailyStat, Keyword.id == KeywordDailyStat.keyword_id)
+        .filter(*in_window(KeywordDailyStat.day, since, until))
+    )
     if user:
-        feeds = db.query(Feed).filter(Feed.user_id == user.id).all()
-        feed_ids = [f.id for f in feeds]
-    else:
-        feed_ids = db.query(Feed.id).all()
-        feed_ids = [f[0] for f in feed_ids]
+        results = results.filter(KeywordDailyStat.user_id == user.id)
     results = (
-        db.query(Keyword.keyword, func.sum(ArticleKeyword.match_count).label("total_matches"))
-        .join(ArticleKeyword, Keyword.id == ArticleKeyword.keyword_id)
-        .join(Article, ArticleKeyword.article_id == Article.id)
-        .filter(Article.feed_id.in_(feed_ids))
-        .group_by(Keyword.id)
-        .order_by(func.sum(ArticleKeyword.match_count).desc())
+        results.group_by(Keyword.id)
+        .having(func.sum(KeywordDailyStat.match_count) > 0)
+        .order_by(func.sum(KeywordDailyStat.match_count).desc())
         .limit(limit)
         .all()
     )
     return [
-        {"keyword": k, "total_matches": total} for k, total in results
+        project({"keyword": k, "total_matches": total}, selected) for k, total in results
     ]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, field_serializer, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -9,6 +9,14 @@ class ArticleKeywordResponse(BaseModel):
     match_count: int
     points: float
     
+    @field_validator('keyword', mode='before')
+    @classmethod
+    def keyword_text(cls, value):
+        # ArticleKeyword rows carry the Keyword object, responses its text
+        if hasattr(value, 'keyword'):
+            return value.keyword
+        return value
+    
     @field_serializer('keyword')
     def serialize_keyword(self, value):
         # If value is a Keyword object, extract the keyword attribute
@@ -52,3 +60,15 @@ class ArticleWithScores(ArticleResponse):
 
     is_liked: bool = False
     is_starred: bool = False
+
+class ArticleSearchResult(ArticleWithScores):
+    relevance: float = 0.0  # Full-text relevance of the match
+    search_score: float = 0.0  # Relevance blended with base_score, results are sorted by it
+    snippet: Optional[str] = None  # Escaped extract with <mark> around matched terms
+
+# Presets for the `fields` parameter of the article list and search endpoints
+ARTICLE_SUMMARY_FIELDS = [
+    'id', 'feed_id', 'title', 'url', 'published_date', 'created_at', 'base_score',
+    'keyword_score', 'user_boost_score', 'total_score', 'age_penalty', 'is_liked', 'is_starred',
+]
+SEARCH_SUMMARY_FIELDS = ARTICLE_SUMMARY_FIELDS + ['relevance', 'search_score', 'snippet']
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, Field, field_serializer
 from typing import Optional
 from datetime import datetime
 
@@ -8,6 +8,7 @@ class FeedBase(BaseModel):
     feed_type: str = "rss"
     description: Optional[str] = None
     autostarred: Optional[bool] = False
+    retention_days: Optional[int] = Field(None, ge=0)  # None = global purge age, 0 = keep forever
 
 class FeedCreate(FeedBase):
     pass
@@ -18,6 +19,7 @@ class FeedUpdate(BaseModel):
     description: Optional[str] = None
     is_active: Optional[bool] = None
     autostarred: Optional[bool] = None
+    retention_days: Optional[int] = Field(None, ge=0)  # Send null to go back to the global purge age
     last_fetched: Optional[datetime] = None
 
 class FeedResponse(FeedBase):
@@ -28,7 +30,11 @@ class FeedResponse(FeedBase):
     last_fetched: Optional[datetime]
     created_at: datetime
     article_count: int
+    unread_count: int = 0
+    starred_count: int = 0
+    last_sync_count: int = 0  # New articles brought by the last sync
     last_sync_status: Optional[str] = None
+    health: Optional[str] = None  # healthy, stale or broken
 
     @field_serializer('last_fetched', 'created_at')
     def serialize_datetime(self, value):
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_serializer
 from datetime import datetime
+from typing import List
 
 class UserArticleInteractionBase(BaseModel):
     is_liked: bool = False
@@ -14,6 +15,13 @@ class UserArticleInteractionUpdate(BaseModel):
     is_starred: bool = None
     is_read: bool = None
 
+class UserArticleInteractionBatch(UserArticleInteractionUpdate):
+    """Flags to set on several articles: the listed ids, or every article matching the filters"""
+    article_ids: List[int] = None
+    feed_id: int = None
+    older_than: datetime = None
+    min_score: float = None
+
 class UserArticleInteractionResponse(UserArticleInteractionBase):
     id: int
     user_id: int
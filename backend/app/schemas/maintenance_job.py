@@ -0,0 +1,27 @@
+from pydantic import BaseModel, field_serializer
+from typing import Optional
+from datetime import datetime
+
+class MaintenanceJobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    checkpoint: int
+    processed: int
+    total: int
+    error_count: int
+    last_error: Optional[str] = None
+    cancel_requested: bool
+    created_by: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @field_serializer('created_at', 'updated_at', 'finished_at')
+    def serialize_datetime(self, value):
+        if value:
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return value
+
+    class Config:
+        from_attributes = True
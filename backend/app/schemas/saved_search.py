@@ -0,0 +1,33 @@
+from pydantic import BaseModel, field_serializer
+from typing import Optional
+from datetime import datetime
+
+class SavedSearchBase(BaseModel):
+    name: str
+    query: str
+    feed_id: Optional[int] = None
+
+class SavedSearchCreate(SavedSearchBase):
+    pass
+
+class SavedSearchUpdate(BaseModel):
+    name: Optional[str] = None
+    query: Optional[str] = None
+    feed_id: Optional[int] = None
+    is_active: Optional[bool] = None
+
+class SavedSearchResponse(SavedSearchBase):
+    id: int
+    user_id: int
+    is_active: bool
+    match_count: int = 0
+    created_at: datetime
+
+    @field_serializer('created_at')
+    def serialize_datetime(self, value):
+        if value:
+            return value.strftime('%Y-%m-%d %H:%M')
+        return value
+
+    class Config:
+        from_attributes = True
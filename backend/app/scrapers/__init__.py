@@ -1,9 +1,9 @@
 import feedparser
-import requests
 from typing import List, Dict, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 import ssl
+from app.scrapers.http_client import http_client
 
 # Workaround for SSL certificate issues
 ssl._create_default_https_context = ssl._create_unverified_context
@@ -12,10 +12,35 @@ class RSSFeedReader:
     """RSS Feed reader"""
     
     @staticmethod
-    def fetch_feed(url: str) -> Optional[Dict]:
-        """Fetch and parse RSS feed"""
+    def fetch_feed(url: str, etag: Optional[str] = None, modified: Optional[str] = None) -> Optional[Dict]:
+        """Fetch and parse RSS feed.
+
+        etag/modified are the validators returned by a previous fetch; when the
+        server answers 304 Not Modified the result has not_modified=True and no
+        articles.
+        """
         try:
-            feed = feedparser.parse(url)
+            headers = {"Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"}
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+            # Certificates are not verified for feeds, same as the SSL workaround above
+            response = http_client.get(url, headers=headers, verify=False)
+            
+            if response.status_code == 304:
+                return {
+                    "title": "",
+                    "articles": [],
+                    "not_modified": True,
+                    "etag": response.headers.get("ETag", etag),
+                    "modified": response.headers.get("Last-Modified", modified)
+                }
+            response.raise_for_status()
+            
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            response_headers["content-location"] = response.url
+            feed = feedparser.parse(response.content, response_headers=response_headers)
             
             if feed.bozo:
                 # Feed has parsing issues but might still be usable
@@ -35,7 +60,10 @@ class RSSFeedReader:
             
             return {
                 "title": feed.feed.get("title", ""),
-                "articles": articles
+                "articles": articles,
+                "not_modified": False,
+                "etag": response.headers.get("ETag"),
+                "modified": response.headers.get("Last-Modified")
             }
         except Exception as e:
             print(f"Error fetching RSS feed {url}: {e}")
@@ -60,10 +88,7 @@ class WebScraper:
     def scrape_page(url: str) -> Optional[Dict]:
         """Scrape a web page and extract content"""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -0,0 +1,70 @@
+"""Shared HTTP fetch layer for the RSS reader and web scraper.
+
+One requests.Session is reused by every fetch so connections (DNS, TCP and
+TLS) are pooled and kept alive per host. Requests to the same host are capped
+in concurrency and spaced by a minimum interval to avoid being throttled.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
+from app.config import settings
+
+# RSS fetching historically skipped certificate verification (see app.scrapers)
+requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client with per-host rate limits"""
+
+    def __init__(self, pool_size: int, max_per_host: int, min_host_interval: float, timeout: float):
+        self.max_per_host = max(1, max_per_host)
+        self.min_host_interval = max(0.0, min_host_interval)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=self.max_per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_next_request: Dict[str, float] = {}
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _wait_turn(self, host: str):
+        """Reserve the next request time for host and sleep until it comes"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._host_next_request.get(host, 0.0))
+            self._host_next_request[host] = start + self.min_host_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, verify: bool = True) -> requests.Response:
+        """GET url through the shared session, honouring the per-host limits"""
+        host = urlsplit(url).netloc.lower()
+        with self._slot(host):
+            self._wait_turn(host)
+            return self.session.get(url, headers=headers, timeout=self.timeout, verify=verify)
+
+
+http_client = HttpClient(
+    pool_size=settings.http_pool_size,
+    max_per_host=settings.http_max_per_host,
+    min_host_interval=settings.http_min_host_interval,
+    timeout=settings.http_timeout,
+)
@@ -1,3 +1,5 @@
+from typing import Iterable, Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models import User
 from app.schemas.user import UserCreate
@@ -21,7 +23,7 @@ class UserService:
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> User:
         """Get user by username (case-insensitive)"""
-        return db.query(User).filter(User.username.ilike(username.lower())).first()
+        return db.query(User).filter(User.username_normalized == username.lower()).first()
     
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> User:
@@ -36,7 +38,31 @@ class UserService:
     @staticmethod
     def authenticate_user(db: Session, username: str, password: str) -> User:
         """Authenticate user with password (case-insensitive username)"""
-        user = UserService.get_user_by_username(db, username.lower())
+        user = UserService.get_user_by_username(db, username)
         if not user or not user.verify_password(password):
             return None
         return user
+
+    @staticmethod
+    def get_data_version(db: Session, user_id: int) -> int:
+        """Current data version of a user (see bump_data_version)"""
+        return db.query(User.data_version).filter(User.id == user_id).scalar() or 0
+    
+    @staticmethod
+    def bump_data_version(db: Session, user_ids: Optional[Iterable[int]] = None):
+        """Mark the listings of some users (all users when None) as changed.
+
+        Runs in the caller's transaction, so the new version becomes visible
+        together with the change it describes. Listing ETags embed the
+        version (see app.utils.http_cache).
+        """
+        statement = update(User).values(
+            data_version=User.data_version + 1,
+            updated_at=User.updated_at  # not an account change
+        )
+        if user_ids is not None:
+            user_ids = set(user_ids)
+            if not user_ids:
+                return
+            statement = statement.where(User.id.in_(user_ids))
+        db.execute(statement.execution_options(synchronize_session=False))
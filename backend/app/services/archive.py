@@ -0,0 +1,147 @@
+"""Compressed cold storage for old article bodies.
+
+Archiving moves the description and content of old articles into
+article_archives, one compressed JSON blob per article (zlib, or zstd when
+the zstandard package is installed), and clears them in the articles table.
+Metadata, scores and keyword hits stay in place; readers get the bodies
+back from bodies() / fill_bodies(), which decompress only the archived
+articles they are shown. On SQLite the full-text index keeps reading the
+archived bodies (see app.services.search), so search and saved searches
+still match them; PostgreSQL and the LIKE fallback only see their titles.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Article, ArticleArchive
+from app.utils.compression import compress, decompress, zstandard
+from app.utils.fast_json import dumps
+
+BODY_FIELDS = ("description", "content")
+
+
+class ArchiveService:
+    """Service for the article cold storage"""
+
+    @staticmethod
+    def codec() -> str:
+        """Codec for new archives: zstd when configured and available, zlib otherwise"""
+        return "zstd" if settings.archive_codec == "zstd" and zstandard is not None else "zlib"
+
+    @staticmethod
+    def archive(db: Session, days: int, chunk_size: Optional[int] = None,
+                now: Optional[datetime] = None) -> Dict[str, int]:
+        """Archive the bodies of articles published more than `days` ago.
+
+        Works purge-style: archive_chunk_size articles per committed
+        transaction, then the freed pages are reclaimed. Returns the number
+        of archived articles and their body sizes before and after compression.
+        """
+        from app.services.purge import PurgeService  # purge -> feed -> article imports this module
+
+        chunk_size = max(1, chunk_size or settings.archive_chunk_size)
+        cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+        codec = ArchiveService.codec()
+        archived = raw_bytes = stored_bytes = last_id = 0
+        while days > 0:
+            rows = db.execute(
+                select(Article.id, Article.description, Article.content)
+                .where(Article.is_archived == False, Article.id > last_id,
+                       func.coalesce(Article.published_date, Article.created_at) < cutoff)
+                .order_by(Article.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            archives = []
+            for article_id, description, content in rows:
+                raw = dumps({"description": description, "content": content})
+                blob, used = compress(raw, codec)
+                archives.append({"article_id": article_id, "codec": used, "body": blob, "raw_size": len(raw)})
+                raw_bytes += len(raw)
+                stored_bytes += len(blob)
+            article_ids = [row.id for row in rows]
+            db.execute(insert(ArticleArchive), archives)
+            db.execute(
+                update(Article).where(Article.id.in_(article_ids))
+                .values(description=None, content=None, is_archived=True, updated_at=Article.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            archived += len(rows)
+            last_id = article_ids[-1]
+        freed = PurgeService.reclaim_space(db) if archived else 0
+        return {"archived_articles": archived, "raw_bytes": raw_bytes, "stored_bytes": stored_bytes,
+                "freed_pages": freed}
+
+    @staticmethod
+    def bodies(db: Session, article_ids: Iterable[int]) -> Dict[int, Dict[str, Optional[str]]]:
+        """Decompressed bodies of the archived articles among `article_ids`"""
+        article_ids = list(article_ids)
+        result = {}
+        for i in range(0, len(article_ids), 500):
+            rows = db.query(ArticleArchive.article_id, ArticleArchive.codec, ArticleArchive.body).filter(
+                ArticleArchive.article_id.in_(article_ids[i:i + 500])
+            )
+            for article_id, codec, blob in rows:
+                result[article_id] = decompress(blob, codec)
+        return result
+
+    @staticmethod
+    def fill_bodies(db: Session, items: List[dict], archived_ids: Iterable[int], fields=BODY_FIELDS):
+        """Put the archived bodies back into response dicts (the `fields` they already have).
+
+        Nothing is read or decompressed when the items carry none of `fields`.
+        """
+        fields = [name for name in fields if any(name in item for item in items)]
+        archived_ids = set(archived_ids)
+        if not fields or not archived_ids:
+            return
+        bodies = ArchiveService.bodies(db, archived_ids)
+        for item in items:
+            body = bodies.get(item["id"])
+            if body is None:
+                continue
+            for name in fields:
+                if name in item:
+                    item[name] = body.get(name)
+
+    @staticmethod
+    def with_bodies(db: Session, rows: List[Tuple]) -> List[Tuple]:
+        """Restore archived bodies in (id, ..., description, content, is_archived) rows.
+
+        Returns the rows without their trailing is_archived column.
+        """
+        bodies = ArchiveService.bodies(db, [row[0] for row in rows if row[-1]])
+        result = []
+        for row in rows:
+            body = bodies.get(row[0])
+            if body is None:
+                result.append(tuple(row[:-1]))
+            else:
+                result.append(tuple(row[:-3]) + (body.get("description"), body.get("content")))
+        return result
+
+    @staticmethod
+    def iter_texts(db: Session, *filters, chunk_size: int = 500) -> Iterator[Tuple[int, str, str, str]]:
+        """(id, title, description, content) of the archived articles matching `filters`, by chunks"""
+        last_id = 0
+        while True:
+            rows = db.query(Article.id, Article.title).filter(
+                Article.is_archived == True, Article.id > last_id, *filters
+            ).order_by(Article.id).limit(chunk_size).all()
+            if not rows:
+                return
+            bodies = ArchiveService.bodies(db, [article_id for article_id, _ in rows])
+            for article_id, title in rows:
+                body = bodies.get(article_id, {})
+                yield article_id, title, body.get("description"), body.get("content")
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def run_scheduled(db: Session) -> Optional[Dict[str, int]]:
+        """Archive run by the scheduler with the configured age"""
+        if settings.archive_after_days <= 0:
+            return None
+        return ArchiveService.archive(db, settings.archive_after_days)
@@ -1,44 +1,81 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session, selectinload, defer, load_only
+from sqlalchemy import desc, and_, or_, insert, select, update, delete, bindparam, func, case, cast, literal, Integer
+from sqlalchemy.sql import Select
+from typing import List, Optional, Tuple
+import itertools
 from datetime import datetime
-from app.models import Article, Feed, Keyword, ArticleKeyword, UserArticleInteraction
-from app.schemas.article import ArticleWithScores
-from app.utils.scoring import extract_keywords_from_text
+from app.config import settings
+from app.models import Article, Feed, Keyword, ArticleKeyword, UserArticleInteraction, SavedSearchMatch
+from app.models.user_article_interaction import LIKE_SCORE_BOOST
+from app.utils.scoring import KeywordMatcher, get_keyword_matcher
 from app.utils.sanitize import sanitize_html
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.search_query import parse_query
+from app.services.search import SearchIndex
+from app.services.saved_search import SavedSearchService
+from app.services.statistics import StatsService
+from app.services.archive import ArchiveService, BODY_FIELDS
+
+# Age penalty per day (0.5 point per 2 days), and how far the floored penalty of
+# total_score can fall short of it: rank_score - RANK_AGE_WEIGHT * now lies in
+# (total_score - RANK_TOLERANCE, total_score]
+RANK_AGE_WEIGHT = 0.25
+RANK_TOLERANCE = 0.5
 
 class ArticleService:
     """Service for article operations"""
     
+    # Types of the keyset cursor values of each paginated ordering (see next_cursor)
+    CURSOR_TYPES = {
+        "score": (float, datetime, int),
+        "date": (datetime, int),
+        "search": (float, datetime, int),
+    }
+    
+    @staticmethod
+    def _clean_body(text: str) -> str:
+        """Remove 'The post ... appeared first on ...' footers and sanitize HTML"""
+        import re
+        # Remove 'The post ... appeared first on ...' and similar patterns
+        text = re.sub(r'The post .*? appeared first on .*?\.?', '', text or "", flags=re.DOTALL)
+        # Sanitize HTML content/description using allowed tags
+        return sanitize_html(text)
+
+    @staticmethod
+    def _keyword_hits(article: Article, matcher: KeywordMatcher) -> List[tuple]:
+        """Match keywords against an article, returning (keyword_id, match_count, points) tuples"""
+        # Extract keyword matches from title, description, and content
+        combined_text = f"{article.title} {article.description} {article.content}"
+        matches = matcher.count(combined_text)
+        weights = matcher.weights
+        return [
+            (keyword_id, match_count, ArticleService._keyword_points(weights[keyword_id], match_count))
+            for keyword_id, match_count in matches.items()
+        ]
+
+    @staticmethod
+    def _keyword_points(weight: float, match_count: int) -> float:
+        # New scoring: first occurrence = keyword.weight, each additional = +0.5
+        if match_count > 0:
+            return weight + (match_count - 1) * 0.5
+        return 0.0
+
     @staticmethod
     def create_article(db: Session, feed_id: int, title: str, url: str, 
                       description: str = "", content: str = "", author: str = "",
                       published_date: Optional[datetime] = None) -> Article:
         """Create or get existing article, removing 'The post ... appeared first on ...' from description/content"""
-        import re
         # Check if article already exists
         existing = db.query(Article).filter(Article.url == url).first()
         if existing:
             return existing
 
-        def remove_footer(text):
-            # Remove 'The post ... appeared first on ...' and similar patterns
-            return re.sub(r'The post .*? appeared first on .*?\.?', '', text, flags=re.DOTALL)
-
-        # Remove unwanted footer from description/content
-        description = remove_footer(description)
-        content = remove_footer(content)
-
-        # Sanitize HTML content/description using allowed tags
-        clean_description = sanitize_html(description)
-        clean_content = sanitize_html(content)
-
         article = Article(
             feed_id=feed_id,
             title=title,
             url=url,
-            description=clean_description,
-            content=clean_content,
+            description=ArticleService._clean_body(description),
+            content=ArticleService._clean_body(content),
             author=author,
             published_date=published_date
         )
@@ -51,7 +88,6 @@ class ArticleService:
         if feed and getattr(feed, 'autostarred', False):
             # Find the feed owner
             user_id = feed.user_id
-            from app.models.user_article_interaction import UserArticleInteraction
             interaction = db.query(UserArticleInteraction).filter_by(user_id=user_id, article_id=article.id).first()
             if not interaction:
                 interaction = UserArticleInteraction(user_id=user_id, article_id=article.id, is_starred=True)
@@ -61,21 +97,76 @@ class ArticleService:
             db.commit()
 
         return article
+
+    @staticmethod
+    def ingest_articles(db: Session, feed: Feed, entries: List[dict]) -> List[Article]:
+        """Insert and score the new articles of a feed in bulk.
+
+        Known URLs are filtered out with a single query, then articles, their
+        ArticleKeyword rows, autostar interactions and saved search matches
+        are written with bulk inserts. Nothing is committed: the caller commits once per feed.
+        Returns the newly created articles.
+        """
+        urls = {e["url"] for e in entries}
+        known = {url for (url,) in db.query(Article.url).filter(Article.url.in_(urls))} if urls else set()
+        matcher = get_keyword_matcher(db, feed.user_id)
+
+        articles = []
+        hits_by_article = []
+        for entry in entries:
+            if entry["url"] in known:
+                continue
+            known.add(entry["url"])
+            article = Article(
+                feed_id=feed.id,
+                title=entry["title"],
+                url=entry["url"],
+                description=ArticleService._clean_body(entry.get("description", "")),
+                content=ArticleService._clean_body(entry.get("content", "")),
+                author=entry.get("author", ""),
+                published_date=entry.get("published_date")
+            )
+            hits = ArticleService._keyword_hits(article, matcher) if matcher.keywords else []
+            article.base_score = sum(points for _, _, points in hits)
+            articles.append(article)
+            hits_by_article.append(hits)
+        if not articles:
+            return []
+
+        db.add_all(articles)
+        db.flush()  # Assigns article ids (single multi-row INSERT)
+
+        keyword_rows = [
+            {"article_id": article.id, "keyword_id": keyword_id, "match_count": match_count, "points": points}
+            for article, hits in zip(articles, hits_by_article)
+            for keyword_id, match_count, points in hits
+        ]
+        if keyword_rows:
+            db.execute(insert(ArticleKeyword), keyword_rows)
+            StatsService.add_keyword_matches(db, [article.id for article in articles])
+
+        # Autostarred feeds: star every new article for the feed owner
+        if feed.autostarred:
+            db.execute(insert(UserArticleInteraction), [
+                {"user_id": feed.user_id, "article_id": article.id, "is_starred": True}
+                for article in articles
+            ])
+
+        ArticleService.refresh_rank(db, [article.id for article in articles])
+
+        # Saved searches: test each new article against them once, here
+        SavedSearchService.percolate(db, feed, articles)
+        return articles
     
     @staticmethod
     def score_article(db: Session, article: Article, feed_owner_id: int) -> float:
         """Score article based on keyword matches"""
-        keywords = db.query(Keyword).filter(
-            Keyword.user_id == feed_owner_id,
-            Keyword.is_active == True
-        ).all()
+        matcher = get_keyword_matcher(db, feed_owner_id)
         
-        if not keywords:
+        if not matcher.keywords:
             return 0.0
         
-        # Extract keyword matches from title, description, and content
-        combined_text = f"{article.title} {article.description} {article.content}"
-        matches = extract_keywords_from_text(combined_text, keywords)
+        hits = ArticleService._keyword_hits(article, matcher)
         
         total_score = 0.0
 
@@ -84,14 +175,7 @@ class ArticleService:
         db.commit()
 
         # Create new ArticleKeyword entries based on current keywords
-        for keyword_id, match_count in matches.items():
-            keyword = next(k for k in keywords if k.id == keyword_id)
-            # New scoring: first occurrence = keyword.weight, each additional = +0.5
-            if match_count > 0:
-                points = keyword.weight + (match_count - 1) * 0.5
-            else:
-                points = 0.0
-
+        for keyword_id, match_count, points in hits:
             article_keyword = ArticleKeyword(
                 article_id=article.id,
                 keyword_id=keyword_id,
@@ -102,74 +186,252 @@ class ArticleService:
             total_score += points
 
         article.base_score = total_score
+        db.flush()
+        ArticleService.refresh_rank(db, [article.id])
         db.commit()
 
         return total_score
     
     @staticmethod
-    def get_articles_with_scores(db: Session, user_id: int, 
-                                  feed_id: Optional[int] = None,
-                                  is_starred: Optional[bool] = None,
-                                  is_read: Optional[bool] = None,
-                                  min_score: float = 0.0,
-                                  limit: int = 50, 
-                                  offset: int = 0,
-                                  sort_by: str = "score") -> List[ArticleWithScores]:
-        """Get articles with computed scores - sort by 'score' or 'date'"""
-        # Get user's feeds
-        feeds = db.query(Feed).filter(Feed.user_id == user_id).all()
-        feed_ids = [f.id for f in feeds]
-        if not feed_ids:
-            return []
-        query = db.query(Article).filter(Article.feed_id.in_(feed_ids))
-        if feed_id:
-            query = query.filter(Article.feed_id == feed_id)
-        # If filtering by starred/read, fetch all interactions for this user and filter article IDs
-        filter_article_ids = None
-        if is_starred is not None or is_read is not None:
-            interaction_filters = [UserArticleInteraction.user_id == user_id]
-            if is_starred is not None:
-                interaction_filters.append(UserArticleInteraction.is_starred == is_starred)
-            if is_read is not None:
-                interaction_filters.append(UserArticleInteraction.is_read == is_read)
-            filtered_interactions = db.query(UserArticleInteraction).filter(*interaction_filters).all()
-            filter_article_ids = [i.article_id for i in filtered_interactions]
-            if filter_article_ids:
-                query = query.filter(Article.id.in_(filter_article_ids))
+    def rescore_keyword(db: Session, user_id: int, keyword: Keyword,
+                        rematch: bool = True, removed: bool = False) -> int:
+        """Apply the change of a single keyword to the user's article scores.
+
+        Only the ArticleKeyword rows of this keyword are inserted, updated or
+        deleted, and each affected Article.base_score is adjusted by the
+        difference. With rematch=False (weight change only) existing matches
+        are re-weighted without scanning article text. removed=True (keyword
+        about to be deleted) or an inactive keyword drops all its matches.
+        Does not commit. Returns the number of articles whose score changed.
+        """
+        existing = {
+            article_id: (ak_id, match_count, points)
+            for ak_id, article_id, match_count, points in db.query(
+                ArticleKeyword.id, ArticleKeyword.article_id, ArticleKeyword.match_count, ArticleKeyword.points
+            ).filter(ArticleKeyword.keyword_id == keyword.id)
+        }
+        inserts, updates, deletes, deltas = [], [], [], {}
+
+        def apply(article_id: int, match_count: int):
+            old = existing.pop(article_id, None)
+            points = ArticleService._keyword_points(keyword.weight, match_count)
+            if not match_count:
+                if old:
+                    deletes.append(old[0])
+                    deltas[article_id] = -old[2]
+            elif old is None:
+                inserts.append({"article_id": article_id, "keyword_id": keyword.id,
+                                "match_count": match_count, "points": points})
+                deltas[article_id] = points
+            elif (old[1], old[2]) != (match_count, points):
+                updates.append({"id": old[0], "match_count": match_count, "points": points})
+                deltas[article_id] = points - old[2]
+
+        if not removed and keyword.is_active and keyword.keyword:
+            if rematch:
+                matcher = KeywordMatcher([(keyword.id, keyword.keyword, keyword.weight)])
+                user_feed_ids = db.query(Feed.id).filter(Feed.user_id == user_id).scalar_subquery()
+                rows = db.query(Article.id, Article.title, Article.description, Article.content).filter(
+                    Article.feed_id.in_(user_feed_ids), Article.is_archived == False
+                ).yield_per(500)
+                archived = ArchiveService.iter_texts(db, Article.feed_id.in_(user_feed_ids))
+                for article_id, title, description, content in itertools.chain(rows, archived):
+                    apply(article_id, matcher.count(f"{title} {description} {content}").get(keyword.id, 0))
             else:
-                # No matches, return empty
-                return []
-        # Order and fetch articles
-        if sort_by == "date":
-            query = query.order_by(desc(Article.published_date or Article.created_at))
-            articles = query.offset(offset).limit(limit).all()
+                for article_id, (_, match_count, _) in list(existing.items()):
+                    apply(article_id, match_count)
+        # Whatever is left no longer matches
+        for article_id in list(existing):
+            apply(article_id, 0)
+
+        if inserts:
+            db.execute(insert(ArticleKeyword), inserts)
+        if updates:
+            db.execute(update(ArticleKeyword), updates)
+        for i in range(0, len(deletes), 500):
+            db.execute(delete(ArticleKeyword).where(ArticleKeyword.id.in_(deletes[i:i + 500])))
+        if deltas:
+            db.execute(
+                update(Article.__table__)
+                .where(Article.__table__.c.id == bindparam("article_id"))
+                .values(base_score=func.coalesce(Article.__table__.c.base_score, 0.0) + bindparam("delta")),
+                [{"article_id": article_id, "delta": delta} for article_id, delta in deltas.items()]
+            )
+            ArticleService.refresh_rank(db, list(deltas))
+        if inserts or updates or deletes:
+            StatsService.refresh_keyword(db, keyword.id)
+        return len(deltas)
+
+    @staticmethod
+    def _floor(value):
+        """SQL floor() that also works on SQLite builds without math functions"""
+        truncated = cast(value, Integer)
+        return case((value < truncated, truncated - 1), else_=truncated)
+
+    @staticmethod
+    def _score_columns(db: Session, now: datetime):
+        """SQL expressions for (user_boost, age_days, age_penalty, total_score).
+
+        They mirror UserArticleInteraction.get_total_score_boost and the
+        age penalty (0.5 point per 2 full days) so ranking runs in the
+        database. UserArticleInteraction must be outer-joined for the user.
+        """
+        published = func.coalesce(Article.published_date, Article.created_at)
+        days = ArticleService._day_number(db, literal(now)) - ArticleService._day_number(db, published)
+        age_days = func.coalesce(ArticleService._floor(days), 0)
+        age_penalty = 0.5 * ArticleService._floor(age_days / 2.0)
+        user_boost = case((UserArticleInteraction.is_liked == True, LIKE_SCORE_BOOST), else_=0.0)
+        total_score = func.coalesce(Article.base_score, 0.0) + user_boost - age_penalty
+        return user_boost, age_days, age_penalty, total_score
+
+    @staticmethod
+    def _day_number(db: Session, value):
+        """SQL expression of a datetime as a fractional number of days"""
+        if db.get_bind().dialect.name == "sqlite":
+            return func.julianday(value)
+        return func.extract("epoch", value) / 86400.0
+
+    @staticmethod
+    def refresh_rank(db: Session, articles):
+        """Recompute Article.rank_score of some articles (list or select of ids). Does not commit.
+
+        rank_score is base_score, plus the like boost of the feed owner, plus
+        RANK_AGE_WEIGHT per day of publication: it does not move with time,
+        so the score listing can walk its index instead of sorting every
+        article (see _top_scored). Call it whenever one of these inputs changes.
+        """
+        liked = select(UserArticleInteraction.id).join(Feed, Feed.user_id == UserArticleInteraction.user_id).where(
+            UserArticleInteraction.article_id == Article.id,
+            Feed.id == Article.feed_id,
+            UserArticleInteraction.is_liked == True
+        ).exists()
+        published = func.coalesce(Article.published_date, Article.created_at)
+        rank = (func.coalesce(Article.base_score, 0.0) + case((liked, LIKE_SCORE_BOOST), else_=0.0)
+                + RANK_AGE_WEIGHT * ArticleService._day_number(db, published))
+        chunks = [articles] if isinstance(articles, Select) else [
+            articles[i:i + 500] for i in range(0, len(articles), 500)
+        ]
+        for chunk in chunks:
+            db.execute(
+                update(Article).where(Article.id.in_(chunk))
+                .values(rank_score=rank, updated_at=Article.updated_at)  # not an article edit
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _top_scored(db: Session, query, total_score, now: datetime, count: int,
+                    after: Optional[list] = None) -> List[int]:
+        """Ids of the first `count` rows of `query` by (total_score, created_at, id), best first.
+
+        Rows are read in batches down the rank_score index; each batch gets
+        its exact total_score, and the scan stops once rows further down (whose
+        total_score is below their rank_score minus the `now` anchor plus
+        RANK_TOLERANCE) can no longer reach the page. The work depends on the
+        page size, not on the number of articles.
+        """
+        anchor = db.scalar(select(RANK_AGE_WEIGHT * ArticleService._day_number(db, literal(now))))
+        query = query.with_entities(Article.id, Article.rank_score, total_score, Article.created_at)
+        if after is not None:
+            order = [total_score, Article.created_at, Article.id]
+            # Float slack: rank_score and total_score are computed by separate expressions
+            query = query.filter(ArticleService._seek(order, after), Article.rank_score <= after[0] + anchor + 1e-6)
+        batch_size = max(count, 100)
+        best, last = [], None
+        while True:
+            batch = query
+            if last is not None:
+                batch = batch.filter(or_(Article.rank_score < last.rank_score,
+                                         and_(Article.rank_score == last.rank_score, Article.id < last.id)))
+            rows = batch.order_by(desc(Article.rank_score), desc(Article.id)).limit(batch_size).all()
+            best.extend((total, created_at, article_id) for article_id, _, total, created_at in rows)
+            if len(rows) < batch_size:
+                break
+            last = rows[-1]
+            if len(best) >= count:
+                best.sort(reverse=True)
+                del best[count:]
+                if last.rank_score - anchor + RANK_TOLERANCE + 1e-6 <= best[-1][0]:
+                    break
+        best.sort(reverse=True)
+        return [article_id for _, _, article_id in best[:count]]
+
+    @staticmethod
+    def _seek(columns: list, values: list):
+        """Keyset predicate for rows after `values` in an all-descending ORDER BY `columns`"""
+        column, value = columns[0], values[0]
+        if len(columns) == 1:
+            return column < value
+        return or_(column < value, and_(column == value, ArticleService._seek(columns[1:], values[1:])))
+
+    @staticmethod
+    def decode_cursor(cursor: str, kind: str) -> Tuple[list, Optional[datetime]]:
+        """Decode a cursor from next_cursor into (sort key, ranking time). Raises ValueError."""
+        return decode_cursor(cursor, kind, ArticleService.CURSOR_TYPES[kind])
+
+    @staticmethod
+    def next_cursor(items: list, limit: int, kind: str, now: Optional[datetime] = None) -> Optional[str]:
+        """Cursor resuming after the last item of a full page, None on the last page.
+
+        Score cursors also carry the ranking time so age penalties, and
+        therefore the order, stay the same while paging.
+        """
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        if kind == "score":
+            key = [last["total_score"], last["created_at"], last["id"]]
+        elif kind == "date":
+            key = [last["published_date"] or last["created_at"], last["id"]]
         else:
-            articles = query.all()
-        article_ids = [a.id for a in articles]
-        # Bulk fetch all interactions for these articles and this user
-        interactions = db.query(UserArticleInteraction).filter(
-            UserArticleInteraction.user_id == user_id,
-            UserArticleInteraction.article_id.in_(article_ids)
-        ).all()
-        interaction_map = {i.article_id: i for i in interactions}
-        scored_articles = []
-        from datetime import datetime
-        for article in articles:
-            article.keywords  # Ensure relationship is loaded
-            interaction = interaction_map.get(article.id)
-            user_boost = interaction.get_total_score_boost() if interaction else 0.0
-            # Age calculation
-            now = datetime.utcnow()
-            dt = article.published_date or article.created_at
-            age_days = (now - dt).days if dt else 0
-            age_penalty = 0.5 * (age_days // 2)
-            total_score = article.base_score + user_boost - age_penalty
-            scored_articles.append((article, user_boost, total_score, interaction, age_days, age_penalty))
-        if sort_by != "date":
-            scored_articles.sort(key=lambda tup: (tup[2], tup[0].created_at), reverse=True)
-            scored_articles = scored_articles[offset:offset+limit]
-        result = []
-        for article, user_boost, total_score, interaction, age_days, age_penalty in scored_articles:
+            key = [last["search_score"], last["created_at"], last["id"]]
+        return encode_cursor(kind, key, now if kind == "score" else None)
+
+    # Article columns behind optional response fields, loaded only when requested via `fields`
+    _FIELD_COLUMNS = ('feed_id', 'title', 'url', 'description', 'content', 'author')
+    # Always loaded: needed for scores, pagination cursors and restoring archived bodies
+    _KEY_COLUMNS = ('published_date', 'created_at', 'base_score', 'is_archived')
+
+    @staticmethod
+    def _field_options(fields: Optional[List[str]]) -> list:
+        """Loader options for results restricted to `fields` (None = all fields)"""
+        keywords = selectinload(Article.keywords).selectinload(ArticleKeyword.keyword)
+        if fields is None:
+            return [keywords]
+        names = [name for name in ArticleService._FIELD_COLUMNS if name in fields] + list(ArticleService._KEY_COLUMNS)
+        options = [load_only(*[getattr(Article, name) for name in names])]
+        if 'keywords' in fields:
+            options.append(keywords)
+        return options
+
+    @staticmethod
+    def _body_fields(fields: Optional[List[str]], with_content: bool = True) -> Tuple[str, ...]:
+        """Body fields a response asks for (the ones archived articles need decompressed)"""
+        return tuple(
+            name for name in BODY_FIELDS
+            if (fields is None or name in fields) and (with_content or name != "content")
+        )
+
+    @staticmethod
+    def _scored_dict(article: Article, user_boost: float, total_score: float,
+                     is_liked: Optional[bool], is_starred: Optional[bool], with_content: bool = True,
+                     fields: Optional[List[str]] = None) -> dict:
+        """Response fields shared by scored list and search results.
+
+        Keywords must be eager-loaded (selectinload) by the caller's query.
+        With `fields`, only those columns are read (the others are not loaded).
+        """
+        article_dict = {
+            'id': article.id,
+            'published_date': article.published_date,
+            'created_at': article.created_at,
+            'base_score': article.base_score,
+        }
+        for name in ArticleService._FIELD_COLUMNS:
+            if fields is None or name in fields:
+                article_dict[name] = getattr(article, name)
+        if 'content' in article_dict and not with_content:
+            article_dict['content'] = None
+        if fields is None or 'keywords' in fields:
             keywords_list = []
             for ak in article.keywords:
                 keywords_list.append({
@@ -179,28 +441,104 @@ class ArticleService:
                     'match_count': ak.match_count,
                     'points': ak.points
                 })
-            article_dict = {
-                'id': article.id,
-                'feed_id': article.feed_id,
-                'title': article.title,
-                'url': article.url,
-                'description': article.description,
-                'content': article.content,
-                'author': article.author,
-                'published_date': article.published_date,
-                'created_at': article.created_at,
-                'base_score': article.base_score,
-                'keywords': keywords_list,
-                'keyword_score': article.base_score,
-                'user_boost_score': user_boost,
-                'total_score': total_score,
-                'is_liked': interaction.is_liked if interaction else False,
-                'is_starred': interaction.is_starred if interaction else False,
-                'age_days': age_days,
-                'age_penalty': age_penalty
-            }
-            article_with_scores = ArticleWithScores(**article_dict)
-            result.append(article_with_scores)
+            article_dict['keywords'] = keywords_list
+        article_dict.update({
+            'keyword_score': article.base_score,
+            'user_boost_score': user_boost,
+            'total_score': total_score,
+            'is_liked': bool(is_liked),
+            'is_starred': bool(is_starred)
+        })
+        return article_dict
+
+    @staticmethod
+    def get_articles_with_scores(db: Session, user_id: int, 
+                                  feed_id: Optional[int] = None,
+                                  is_starred: Optional[bool] = None,
+                                  is_read: Optional[bool] = None,
+                                  min_score: float = 0.0,
+                                  limit: int = 50, 
+                                  offset: int = 0,
+                                  sort_by: str = "score",
+                                  after: Optional[list] = None,
+                                  now: Optional[datetime] = None,
+                                  saved_search_id: Optional[int] = None,
+                                  fields: Optional[List[str]] = None) -> List[dict]:
+        """Get articles with computed scores - sort by 'score' or 'date'.
+
+        Scores, filtering, ordering and paging are computed in SQL, so only
+        the requested page is loaded; score pages are found by walking the
+        rank_score index (_top_scored) rather than sorting every article. `after` is a decoded cursor key: when
+        given, the page starts right after that row instead of at `offset`.
+        `saved_search_id` restricts the list to the precomputed matches of a
+        saved search. With `fields`, unrequested columns are not loaded.
+
+        Returns dicts with the ArticleWithScores fields, built from trusted
+        ORM data; routes serialize them without a validation pass
+        (app.utils.fields.project).
+        """
+        now = now or datetime.utcnow()
+        user_boost, age_days, age_penalty, total_score = ArticleService._score_columns(db, now)
+        user_feed_ids = db.query(Feed.id).filter(Feed.user_id == user_id).scalar_subquery()
+        columns = (Article, user_boost, age_days, age_penalty, total_score,
+                   UserArticleInteraction.is_liked, UserArticleInteraction.is_starred)
+        query = (
+            db.query(*columns)
+            .outerjoin(UserArticleInteraction, and_(
+                UserArticleInteraction.article_id == Article.id,
+                UserArticleInteraction.user_id == user_id
+            ))
+            .filter(Article.base_score >= min_score)
+        )
+        if feed_id:
+            # Ownership as a constant test: an IN over the user's feeds would keep the
+            # planner from reading this feed in rank_score order
+            query = query.filter(Article.feed_id == feed_id,
+                                 db.query(Feed.id).filter(Feed.id == feed_id, Feed.user_id == user_id).exists())
+        elif sort_by == "date":
+            query = query.filter(Article.feed_id.in_(user_feed_ids))
+        else:
+            # feed_id + 0: no index on the expression, so the score listing walks the
+            # rank_score index instead of the feed_id one followed by a sort
+            query = query.filter((Article.feed_id + 0).in_(user_feed_ids))
+        if saved_search_id is not None:
+            query = query.filter(Article.id.in_(
+                db.query(SavedSearchMatch.article_id).filter(SavedSearchMatch.saved_search_id == saved_search_id)
+            ))
+        # Starred/read filters only match articles that have an interaction row
+        if is_starred is not None:
+            query = query.filter(UserArticleInteraction.is_starred == is_starred)
+        if is_read is not None:
+            query = query.filter(UserArticleInteraction.is_read == is_read)
+        if sort_by == "date":
+            # Order and fetch the page
+            order = [func.coalesce(Article.published_date, Article.created_at), Article.id]
+            if after is not None:
+                query = query.filter(ArticleService._seek(order, after))
+            query = query.order_by(*[desc(column) for column in order])
+            rows = query.options(*ArticleService._field_options(fields)).offset(offset).limit(limit).all()
+        else:
+            # Pick the page from the rank index, then load just its rows
+            page_ids = ArticleService._top_scored(db, query, total_score, now, offset + limit, after)[offset:]
+            rows = (
+                db.query(*columns)
+                .outerjoin(UserArticleInteraction, and_(
+                    UserArticleInteraction.article_id == Article.id,
+                    UserArticleInteraction.user_id == user_id
+                ))
+                .filter(Article.id.in_(page_ids))
+                .options(*ArticleService._field_options(fields))
+                .all()
+            ) if page_ids else []
+            rows.sort(key=lambda row: (row[4], row[0].created_at, row[0].id), reverse=True)
+        result = []
+        for article, boost, days, penalty, total, is_liked, starred in rows:
+            article_dict = ArticleService._scored_dict(article, boost, total, is_liked, starred, fields=fields)
+            article_dict.update(age_days=days, age_penalty=penalty)
+            result.append(article_dict)
+        body_fields = ArticleService._body_fields(fields)
+        if body_fields:
+            ArchiveService.fill_bodies(db, result, [row[0].id for row in rows if row[0].is_archived], body_fields)
         return result
     
     @staticmethod
@@ -208,71 +546,64 @@ class ArticleService:
                        feed_id: Optional[int] = None,
                        min_score: float = 0.0,
                        limit: int = 50,
-                       offset: int = 0) -> List[Article]:
-        """Search articles by title, description, or content with complex query support (AND, OR, NOT, parentheses, quoted phrases)"""
-        from sqlalchemy import and_, or_, not_
-        import re
+                       offset: int = 0,
+                       after: Optional[list] = None,
+                       with_content: bool = True,
+                       with_snippets: bool = True,
+                       fields: Optional[List[str]] = None) -> List[dict]:
+        """Search articles by title, description, or content with complex query support (AND, OR, NOT, parentheses, quoted phrases).
 
-        feeds = db.query(Feed).filter(Feed.user_id == user_id).all()
-        feed_ids = [f.id for f in feeds]
-        if not feed_ids:
-            return []
-
-        # Tokenize query: support quoted phrases, AND, OR, NOT, parentheses
-        def tokenize(query):
-            # Match quoted phrases or words/ops/parentheses
-            return re.findall(r'"[^"]+"|\(|\)|\bAND\b|\bOR\b|\bNOT\b|\S+', query, re.IGNORECASE)
-
-        # Parse tokens into SQLAlchemy filter
-        def parse(tokens):
-            def parse_atom():
-                token = tokens.pop(0)
-                if token == '(':  # Parentheses
-                    expr = parse_expr()
-                    tokens.pop(0)  # Remove ')'
-                    return expr
-                elif token.upper() == 'NOT':
-                    return not_(parse_atom())
-                elif token.startswith('"') and token.endswith('"'):
-                    val = token[1:-1]
-                    return or_(
-                        Article.title.ilike(f"%{val}%"),
-                        Article.description.ilike(f"%{val}%"),
-                        Article.content.ilike(f"%{val}%")
-                    )
-                else:
-                    val = token
-                    return or_(
-                        Article.title.ilike(f"%{val}%"),
-                        Article.description.ilike(f"%{val}%"),
-                        Article.content.ilike(f"%{val}%")
-                    )
-
-            def parse_expr():
-                expr = parse_atom()
-                while tokens and tokens[0].upper() in ('AND', 'OR'):
-                    op = tokens.pop(0).upper()
-                    right = parse_atom()
-                    if op == 'AND':
-                        expr = and_(expr, right)
-                    else:
-                        expr = or_(expr, right)
-                return expr
-            return parse_expr()
-
-        tokens = tokenize(query_text)
-        if tokens:
-            search_filter = parse(tokens)
-        else:
-            search_filter = None
+        Returns ArticleSearchResult-shaped dicts sorted by search_score,
+        which blends the index relevance with base_score using the
+        search_*_weight settings. Snippets are highlighted extracts of the
+        match; with_content=False leaves article bodies unloaded, and
+        `fields` works as in get_articles_with_scores.
+        Like the list, the page is assembled from one query (interactions
+        joined, keywords eager-loaded) plus one for snippets.
+        """
+        # Parse the query and compile it against the full-text index
+        parsed = parse_query(query_text)
+        matches = SearchIndex.ranked(parsed) if parsed is not None else None
+        relevance = matches.c.relevance if matches is not None else literal(0.0)
+        search_score = (settings.search_relevance_weight * relevance
+                        + settings.search_base_score_weight * func.coalesce(Article.base_score, 0.0))
+        user_boost = case((UserArticleInteraction.is_liked == True, LIKE_SCORE_BOOST), else_=0.0)
+        user_feed_ids = db.query(Feed.id).filter(Feed.user_id == user_id).scalar_subquery()
 
-        query = db.query(Article).filter(
-            Article.feed_id.in_(feed_ids),
-            Article.base_score >= min_score
+        query = (
+            db.query(Article, relevance, search_score, user_boost,
+                     UserArticleInteraction.is_liked, UserArticleInteraction.is_starred)
+            .outerjoin(UserArticleInteraction, and_(
+                UserArticleInteraction.article_id == Article.id,
+                UserArticleInteraction.user_id == user_id
+            ))
+            .filter(Article.feed_id.in_(user_feed_ids), Article.base_score >= min_score)
+            .options(*ArticleService._field_options(fields))
         )
-        if search_filter is not None:
-            query = query.filter(search_filter)
+        if matches is not None:
+            query = query.join(matches, matches.c.id == Article.id)
+        elif parsed is not None:
+            query = query.filter(SearchIndex.filter(parsed))
+        if not with_content and fields is None:
+            query = query.options(defer(Article.content))
         if feed_id:
             query = query.filter(Article.feed_id == feed_id)
-        query = query.order_by(desc(Article.base_score), desc(Article.created_at))
-        return query.offset(offset).limit(limit).all()
+        order = [search_score, Article.created_at, Article.id]
+        if after is not None:
+            query = query.filter(ArticleService._seek(order, after))
+        query = query.order_by(*[desc(column) for column in order])
+        rows = query.offset(offset).limit(limit).all()
+        snippets = {}
+        if with_snippets and parsed is not None and (fields is None or 'snippet' in fields):
+            snippets = SearchIndex.snippets(db, parsed, [row[0].id for row in rows])
+        result = []
+        for article, rel, score, boost, is_liked, is_starred in rows:
+            article_dict = ArticleService._scored_dict(
+                article, boost, (article.base_score or 0.0) + boost, is_liked, is_starred, with_content, fields
+            )
+            article_dict.update(relevance=rel, search_score=score, snippet=snippets.get(article.id))
+            result.append(article_dict)
+        body_fields = ArticleService._body_fields(fields, with_content)
+        if body_fields:
+            ArchiveService.fill_bodies(db, result, [row[0].id for row in rows if row[0].is_archived], body_fields)
+        return result
@@ -0,0 +1,149 @@
+"""Streaming article exports (NDJSON and CSV).
+
+Articles are read in id order with yield_per, export_chunk_size rows at a
+time, and encoded as they arrive, so memory use stays flat whatever the
+size of the corpus. Keyword hits are fetched with one query per chunk.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Article, ArticleKeyword, Feed, Keyword, UserArticleInteraction
+from app.services.archive import ArchiveService, BODY_FIELDS
+from app.services.article import ArticleService
+from app.utils.fast_json import dumps
+
+# Media type of each export format
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_COLUMNS = [
+    "id", "feed_id", "feed_name", "title", "url", "author", "published_date", "created_at",
+    "base_score", "user_boost_score", "age_penalty", "total_score", "is_liked", "is_starred", "is_read",
+    "keywords", "description",
+]
+
+# Encoded output is handed to the response in pieces of about this size
+_FLUSH_BYTES = 64 * 1024
+
+
+class ExportService:
+    """Service for article exports"""
+
+    @staticmethod
+    def iter_articles(db: Session, user_id: int, feed_id: Optional[int] = None,
+                      since: Optional[datetime] = None, with_content: bool = False,
+                      now: Optional[datetime] = None) -> Iterator[Dict]:
+        """Yield the user's articles, oldest id first, as plain dicts.
+
+        Scores are computed as in the article list (at `now`). `since` keeps
+        articles stored at or after that time, for incremental exports.
+        Datetimes are ISO 8601 strings.
+        """
+        now = now or datetime.utcnow()
+        user_boost, _, age_penalty, total_score = ArticleService._score_columns(db, now)
+        columns = [
+            Article.id, Article.feed_id, Feed.name.label("feed_name"), Article.title, Article.url,
+            Article.author, Article.published_date, Article.created_at, Article.base_score,
+            user_boost.label("user_boost_score"), age_penalty.label("age_penalty"),
+            total_score.label("total_score"), UserArticleInteraction.is_liked,
+            UserArticleInteraction.is_starred, UserArticleInteraction.is_read, Article.description,
+            Article.is_archived,
+        ]
+        if with_content:
+            columns.append(Article.content)
+        statement = (
+            select(*columns)
+            .join(Feed, Feed.id == Article.feed_id)
+            .outerjoin(UserArticleInteraction, and_(
+                UserArticleInteraction.article_id == Article.id,
+                UserArticleInteraction.user_id == user_id
+            ))
+            .where(Feed.user_id == user_id)
+            .order_by(Article.id)
+            .execution_options(yield_per=settings.export_chunk_size)
+        )
+        if feed_id is not None:
+            statement = statement.where(Article.feed_id == feed_id)
+        if since is not None:
+            statement = statement.where(Article.created_at >= since)
+
+        for chunk in db.execute(statement).partitions():
+            hits = ExportService._keyword_hits(db, [row.id for row in chunk])
+            bodies = ArchiveService.bodies(db, [row.id for row in chunk if row.is_archived])
+            for row in chunk:
+                item = dict(row._mapping)
+                del item["is_archived"]
+                if row.id in bodies:
+                    item.update({name: bodies[row.id].get(name) for name in item.keys() & BODY_FIELDS})
+                for key in ("published_date", "created_at"):
+                    if item[key] is not None:
+                        item[key] = item[key].isoformat()
+                for key in ("is_liked", "is_starred", "is_read"):
+                    item[key] = bool(item[key])
+                item["base_score"] = float(item["base_score"] or 0.0)
+                item["user_boost_score"] = float(item["user_boost_score"])
+                item["age_penalty"] = float(item["age_penalty"])
+                item["total_score"] = float(item["total_score"])
+                item["keywords"] = hits.get(row.id, [])
+                yield item
+
+    @staticmethod
+    def _keyword_hits(db: Session, article_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Keyword hits of a chunk of articles, best first"""
+        rows = db.execute(
+            select(ArticleKeyword.article_id, Keyword.keyword, ArticleKeyword.match_count, ArticleKeyword.points)
+            .join(Keyword, Keyword.id == ArticleKeyword.keyword_id)
+            .where(ArticleKeyword.article_id.in_(article_ids))
+            .order_by(ArticleKeyword.article_id, ArticleKeyword.points.desc())
+        ).all()
+        hits: Dict[int, List[Dict]] = {}
+        for article_id, keyword, match_count, points in rows:
+            hits.setdefault(article_id, []).append(
+                {"keyword": keyword, "match_count": match_count, "points": points}
+            )
+        return hits
+
+    @staticmethod
+    def encode(items: Iterator[Dict], fmt: str, with_content: bool = False) -> Iterator[bytes]:
+        """Encode article dicts as NDJSON lines or CSV rows (with a header), in buffered pieces"""
+        buffer = io.StringIO() if fmt == "csv" else io.BytesIO()
+        if fmt == "csv":
+            writer = csv.DictWriter(buffer, EXPORT_COLUMNS + (["content"] if with_content else []))
+            writer.writeheader()
+        for item in items:
+            if fmt == "csv":
+                # Keyword hits do not fit a flat row: keep them as a JSON cell
+                writer.writerow(dict(item, keywords=json.dumps(item["keywords"], ensure_ascii=False)))
+            else:
+                buffer.write(dumps(item) + b"\n")
+            if buffer.tell() >= _FLUSH_BYTES:
+                yield ExportService._drain(buffer)
+        if buffer.tell():
+            yield ExportService._drain(buffer)
+
+    @staticmethod
+    def _drain(buffer) -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    @staticmethod
+    def stream(user_id: int, fmt: str, feed_id: Optional[int] = None, since: Optional[datetime] = None,
+               with_content: bool = False) -> Iterator[bytes]:
+        """Encoded export of a user's articles, read through its own session.
+
+        The session lives as long as the generator, independently of the
+        request that started it.
+        """
+        db = SessionLocal()
+        try:
+            items = ExportService.iter_articles(db, user_id, feed_id, since, with_content)
+            yield from ExportService.encode(items, fmt, with_content)
+        finally:
+            db.close()
@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import and_, bindparam, case, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.config import settings
+from app.models import Article, Feed, UserArticleInteraction
+from app.scrapers import RSSFeedReader, WebScraper
+from app.services import UserService
+from app.services.article import ArticleService
+
+
+class FeedSyncError(Exception):
+    """Raised when a feed cannot be fetched or contains no articles"""
+
+
+class FeedService:
+    """Service for feed synchronisation"""
+
+    @staticmethod
+    def fetch(feed_type: str, url: str, etag: Optional[str] = None,
+              modified: Optional[str] = None) -> Optional[Dict]:
+        """Download and parse a feed (network only, safe to call from worker threads)"""
+        if feed_type == "rss":
+            return RSSFeedReader.fetch_feed(url, etag, modified)
+        if feed_type == "scraper":
+            return WebScraper.scrape_page(url)
+        return None
+
+    @staticmethod
+    def store(db: Session, feed: Feed, result: Optional[Dict]) -> int:
+        """Persist a fetch result for a feed and update its sync status.
+
+        New articles and the feed status are written in a single commit,
+        together with a bump of the owner's data version when something
+        shown changed (new articles, sync status or count), so listings of
+        an unchanged feed keep their ETag.
+        Returns the number of new articles. Raises FeedSyncError (after
+        marking the feed as failed) when an RSS feed is unusable.
+        """
+        count = 0
+        previous_status, previous_count = feed.last_sync_status, feed.last_sync_count
+        try:
+            if feed.feed_type == "rss" and result and result.get("not_modified"):
+                # 304: nothing changed since the last fetch, skip parsing and scoring
+                pass
+            elif feed.feed_type == "rss":
+                if not result or not result.get("articles"):
+                    raise FeedSyncError("Feed is unreachable, invalid, or contains no articles.")
+                last_fetched = feed.last_fetched
+                if last_fetched is not None and last_fetched.tzinfo is not None:
+                    # Convert last_fetched to naive UTC
+                    last_fetched = last_fetched.replace(tzinfo=None)
+                entries = []
+                for article_data in result["articles"]:
+                    pub_date = article_data.get("published_date")
+                    if pub_date is not None and hasattr(pub_date, 'tzinfo') and pub_date.tzinfo is not None:
+                        # Convert pub_date to naive UTC
+                        pub_date = pub_date.replace(tzinfo=None)
+                    # Only add if published_date is newer than last_fetched (or if last_fetched is None)
+                    if last_fetched is not None and pub_date is not None:
+                        if pub_date <= last_fetched:
+                            continue
+                    entries.append(dict(article_data, published_date=pub_date))
+                count = len(ArticleService.ingest_articles(db, feed, entries))
+            elif feed.feed_type == "scraper":
+                if result:
+                    count = len(ArticleService.ingest_articles(db, feed, [result]))
+            if count:
+                FeedService.refresh_counts(db, [feed.id])
+            feed.last_sync_count = count
+            if feed.feed_type == "rss":
+                feed.etag = result.get("etag")
+                feed.last_modified = result.get("modified")
+            feed.last_fetched = datetime.utcnow()
+            feed.last_sync_status = "success"
+            if count or previous_status != "success" or previous_count != count:
+                UserService.bump_data_version(db, [feed.user_id])
+            db.commit()
+            return count
+        except Exception:
+            db.rollback()
+            feed.last_sync_status = "failed"
+            if previous_status != "failed":
+                UserService.bump_data_version(db, [feed.user_id])
+            db.commit()
+            raise
+
+    @staticmethod
+    def refresh_counts(db: Session, feed_ids: Optional[Iterable[int]] = None):
+        """Recompute the cached article/unread/starred counts of some feeds (all when None).
+
+        `feed_ids` can also be a select of feed ids. One grouped query over
+        the feeds' articles and their owners' interactions; nothing is
+        committed.
+        """
+        feeds = select(Feed.id)
+        counts = (
+            select(
+                Article.feed_id,
+                func.count(Article.id),
+                func.sum(case((UserArticleInteraction.is_read == True, 0), else_=1)),
+                func.sum(case((UserArticleInteraction.is_starred == True, 1), else_=0)),
+            )
+            .join(Feed, Feed.id == Article.feed_id)
+            .outerjoin(UserArticleInteraction, and_(
+                UserArticleInteraction.article_id == Article.id,
+                UserArticleInteraction.user_id == Feed.user_id
+            ))
+            .group_by(Article.feed_id)
+        )
+        if feed_ids is not None:
+            if not isinstance(feed_ids, Select):
+                feed_ids = list(feed_ids)
+                if not feed_ids:
+                    return
+            feeds = feeds.where(Feed.id.in_(feed_ids))
+            counts = counts.where(Article.feed_id.in_(feed_ids))
+        by_feed = {feed_id: (0, 0, 0) for feed_id in db.scalars(feeds)}
+        by_feed.update({feed_id: (total, unread, starred) for feed_id, total, unread, starred in db.execute(counts)})
+        if not by_feed:
+            return
+        table = Feed.__table__
+        db.execute(
+            update(table).where(table.c.id == bindparam("feed_id")).values(
+                article_count=bindparam("total"), unread_count=bindparam("unread"),
+                starred_count=bindparam("starred"), updated_at=table.c.updated_at  # not a feed edit
+            ),
+            [{"feed_id": feed_id, "total": total, "unread": unread, "starred": starred}
+             for feed_id, (total, unread, starred) in by_feed.items()]
+        )
+
+    @staticmethod
+    def sync_feed(db: Session, feed: Feed) -> int:
+        """Fetch and store a single feed"""
+        result = FeedService.fetch(feed.feed_type, feed.url, feed.etag, feed.last_modified)
+        return FeedService.store(db, feed, result)
+
+    @staticmethod
+    def sync_feeds(db: Session, feeds: List[Feed], max_workers: Optional[int] = None) -> List[Dict]:
+        """Sync several feeds, downloading them in parallel.
+
+        Fetches run in a bounded thread pool; results are stored from the
+        calling thread as they complete so the database only sees one writer.
+        Returns one summary dict per feed.
+        """
+        if not feeds:
+            return []
+        workers = max(1, min(max_workers or settings.sync_max_workers, len(feeds)))
+        summaries = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-sync") as executor:
+            futures = {
+                executor.submit(FeedService.fetch, feed.feed_type, feed.url, feed.etag, feed.last_modified): feed
+                for feed in feeds
+            }
+            for future in as_completed(futures):
+                feed = futures[future]
+                summary = {"feed_id": feed.id, "user_id": feed.user_id, "name": feed.name, "status": "success",
+                           "synced": 0, "not_modified": False, "error": None}
+                try:
+                    result = future.result()
+                    summary["synced"] = FeedService.store(db, feed, result)
+                    summary["not_modified"] = bool(result and result.get("not_modified"))
+                except Exception as e:
+                    if feed.last_sync_status != "failed":
+                        feed.last_sync_status = "failed"
+                        UserService.bump_data_version(db, [feed.user_id])
+                        db.commit()
+                    summary["status"] = "failed"
+                    summary["error"] = str(e)
+                summaries.append(summary)
+        summaries.sort(key=lambda s: (s["user_id"], s["feed_id"]))
+        return summaries
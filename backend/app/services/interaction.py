@@ -0,0 +1,114 @@
+"""Set-based read/star/like changes.
+
+Changes are applied to any number of articles with one statement: an
+INSERT ... SELECT ... ON CONFLICT (user_id, article_id) DO UPDATE upsert
+when a flag is set, or a plain UPDATE when flags are only cleared (a
+missing interaction row already means "not read/starred/liked"). Rows
+that already have the requested values are left untouched.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import func, literal, or_, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Article, Feed, UserArticleInteraction
+from app.models.user_article_interaction import LIKE_SCORE_BOOST
+from app.services import UserService
+from app.services.article import ArticleService
+from app.services.feed import FeedService
+from app.services.statistics import StatsService
+
+FLAGS = ("is_read", "is_starred", "is_liked")
+
+
+class InteractionService:
+    """Service for user/article interactions"""
+
+    @staticmethod
+    def select_articles(db: Session, user_id: int, article_ids: Optional[List[int]] = None,
+                        feed_id: Optional[int] = None, older_than: Optional[datetime] = None,
+                        min_score: Optional[float] = None):
+        """Select of the ids of the user's articles matching all the given filters"""
+        query = select(Article.id).where(
+            Article.feed_id.in_(select(Feed.id).where(Feed.user_id == user_id))
+        )
+        if article_ids is not None:
+            query = query.where(Article.id.in_(article_ids))
+        if feed_id is not None:
+            query = query.where(Article.feed_id == feed_id)
+        if older_than is not None:
+            query = query.where(func.coalesce(Article.published_date, Article.created_at) < older_than)
+        if min_score is not None:
+            query = query.where(Article.base_score >= min_score)
+        return query
+
+    @staticmethod
+    def apply(db: Session, user_id: int, articles, changes: Dict[str, bool]) -> int:
+        """Set interaction flags of the user on the articles of a select of ids.
+
+        `changes` maps flag names (is_read, is_starred, is_liked) to their new
+        value. Returns the number of interactions created or changed; if there
+        were any, the counts of the affected feeds (and the rank scores, for
+        likes) are refreshed and the user's data version is bumped. Read
+        changes are counted in the daily read statistics. Nothing is committed.
+        """
+        changes = {flag: bool(value) for flag, value in changes.items() if flag in FLAGS and value is not None}
+        if not changes:
+            return 0
+        values = dict(changes)
+        if "is_liked" in changes:
+            values["user_score_boost"] = LIKE_SCORE_BOOST if changes["is_liked"] else 0.0
+        now = datetime.utcnow()
+        table = UserArticleInteraction.__table__
+        dialect = db.get_bind().dialect.name
+        if "is_read" in changes:
+            StatsService.record_reads(db, user_id, articles, changes["is_read"])
+
+        if not any(changes.values()) or dialect not in ("sqlite", "postgresql"):
+            # Clearing flags only touches existing rows; other databases get update + insert
+            changed = db.execute(
+                update(table)
+                .where(table.c.user_id == user_id, table.c.article_id.in_(articles),
+                       or_(*[table.c[flag].is_distinct_from(value) for flag, value in changes.items()]))
+                .values(updated_at=now, **values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if any(changes.values()):
+                changed += InteractionService._insert_missing(db, user_id, articles, values, now)
+        else:
+            insert = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+            columns = ["user_id", "article_id", "is_read", "is_starred", "is_liked", "user_score_boost",
+                       "created_at", "updated_at"]
+            defaults = {"is_read": False, "is_starred": False, "is_liked": False, "user_score_boost": 0.0,
+                        "created_at": now, "updated_at": now}
+            defaults.update(values)
+            rows = select(
+                literal(user_id).label("user_id"), articles.subquery().c.id.label("article_id"),
+                *[literal(defaults[name]).label(name) for name in columns[2:]]
+            ).where(true())  # SQLite needs a WHERE to tell the upsert's ON from a join's
+            statement = insert.from_select(columns, rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=["user_id", "article_id"],
+                set_={**{name: statement.excluded[name] for name in values}, "updated_at": statement.excluded.updated_at},
+                where=or_(*[table.c[flag].is_distinct_from(statement.excluded[flag]) for flag in changes])
+            )
+            changed = db.execute(statement).rowcount
+        if changed:
+            if "is_liked" in changes:
+                ArticleService.refresh_rank(db, articles)
+            FeedService.refresh_counts(db, select(Article.feed_id).where(Article.id.in_(articles)).distinct())
+            UserService.bump_data_version(db, [user_id])
+        return changed
+
+    @staticmethod
+    def _insert_missing(db: Session, user_id: int, articles, values: Dict, now: datetime) -> int:
+        """Create interactions (with `values`) for the selected articles that have none yet"""
+        missing = articles.where(~select(UserArticleInteraction.id).where(
+            UserArticleInteraction.user_id == user_id,
+            UserArticleInteraction.article_id == Article.id
+        ).exists())
+        row = {"is_read": False, "is_starred": False, "is_liked": False, "user_score_boost": 0.0,
+               "created_at": now, "updated_at": now, **values}
+        columns = ["user_id", "article_id"] + list(row)
+        rows = select(literal(user_id), missing.subquery().c.id, *[literal(value) for value in row.values()])
+        return db.execute(UserArticleInteraction.__table__.insert().from_select(columns, rows)).rowcount
@@ -0,0 +1,134 @@
+"""Chunked article purge and space reclamation.
+
+Expired articles are deleted purge_chunk_size at a time with set-based
+DELETEs (keyword matches, interactions, saved search matches, archived
+bodies, then the articles), one short transaction per chunk, so a large
+purge neither loads the articles nor holds the write lock for long. Feeds
+can override the purge age with retention_days. On SQLite the freed pages
+are then returned to the file system with an incremental vacuum.
+"""
+import traceback
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import and_, delete, func, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Article, ArticleArchive, ArticleKeyword, Feed, SavedSearchMatch, UserArticleInteraction
+from app.services import UserService
+from app.services.feed import FeedService
+from app.services.statistics import StatsService
+
+# Tables whose rows point at articles, emptied before the articles of each chunk
+_DEPENDENTS = (ArticleKeyword, UserArticleInteraction, SavedSearchMatch, ArticleArchive)
+
+
+class PurgeService:
+    """Service for article purges"""
+
+    @staticmethod
+    def expired(db: Session, days: Optional[int], keep_starred: bool, now: Optional[datetime] = None):
+        """Select of (id, feed_id, user_id) of the articles to purge, None when no retention applies.
+
+        Articles are dated by publication (creation when unknown). Feeds
+        without retention_days use `days` (None or 0: they are not purged).
+        """
+        now = now or datetime.utcnow()
+        published = func.coalesce(Article.published_date, Article.created_at)
+        conditions = []
+        if days:
+            conditions.append(and_(Feed.retention_days == None, published < now - timedelta(days=days)))
+        overrides = [value for (value,) in db.query(Feed.retention_days).filter(Feed.retention_days > 0).distinct()]
+        for value in overrides:
+            conditions.append(and_(Feed.retention_days == value, published < now - timedelta(days=value)))
+        if not conditions:
+            return None
+        statement = (
+            select(Article.id, Article.feed_id, Feed.user_id)
+            .join(Feed, Feed.id == Article.feed_id)
+            .where(or_(*conditions))
+        )
+        if keep_starred:
+            statement = statement.where(~select(UserArticleInteraction.id).where(
+                UserArticleInteraction.article_id == Article.id,
+                UserArticleInteraction.is_starred == True
+            ).exists())
+        return statement
+
+    @staticmethod
+    def purge(db: Session, days: Optional[int], keep_starred: Optional[bool] = None,
+              chunk_size: Optional[int] = None) -> Dict[str, int]:
+        """Delete expired articles chunk by chunk, committing each chunk, then reclaim the space"""
+        keep_starred = settings.purge_keep_starred if keep_starred is None else keep_starred
+        chunk_size = max(1, chunk_size or settings.purge_chunk_size)
+        expired = PurgeService.expired(db, days, keep_starred)
+        purged, last_id = 0, 0
+        while expired is not None:
+            rows = db.execute(expired.where(Article.id > last_id).order_by(Article.id).limit(chunk_size)).all()
+            if not rows:
+                break
+            article_ids = [row.id for row in rows]
+            StatsService.forget_articles(db, article_ids)
+            for model in _DEPENDENTS:
+                db.execute(delete(model).where(model.article_id.in_(article_ids)))
+            db.execute(delete(Article).where(Article.id.in_(article_ids)).execution_options(synchronize_session=False))
+            FeedService.refresh_counts(db, list({row.feed_id for row in rows}))
+            UserService.bump_data_version(db, {row.user_id for row in rows})
+            db.commit()
+            purged += len(rows)
+            last_id = article_ids[-1]
+        freed = PurgeService.reclaim_space(db) if purged else 0
+        return {"purged_articles": purged, "freed_pages": freed}
+
+    @staticmethod
+    def ensure_auto_vacuum(engine: Engine) -> Optional[str]:
+        """Ask SQLite for incremental auto-vacuum; returns the mode in effect.
+
+        The mode only applies to a database without tables yet. Existing
+        files keep "none" until a full VACUUM (see vacuum()) rewrites them.
+        """
+        if engine.dialect.name != "sqlite":
+            return None
+        with engine.begin() as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 0:
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        return {0: "none", 1: "full", 2: "incremental"}.get(mode)
+
+    @staticmethod
+    def reclaim_space(db: Session) -> int:
+        """Return free pages to the file system (SQLite incremental vacuum); returns their number"""
+        if db.get_bind().dialect.name != "sqlite":
+            return 0  # PostgreSQL reuses the space through autovacuum
+        try:
+            if db.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                return 0
+            free = db.execute(text("PRAGMA freelist_count")).scalar() or 0
+            db.commit()
+            raw = db.get_bind().raw_connection()
+            try:
+                # execute() would step the pragma once, freeing a single page; executescript() runs it to the end
+                raw.driver_connection.executescript("PRAGMA incremental_vacuum;")
+            finally:
+                raw.close()
+            return free - (db.execute(text("PRAGMA freelist_count")).scalar() or 0)
+        except Exception:
+            db.rollback()
+            print("[Purge Error] incremental vacuum failed:", traceback.format_exc())
+            return 0
+
+    @staticmethod
+    def vacuum(engine: Engine) -> Dict[str, Optional[str]]:
+        """Rewrite a SQLite database with a full VACUUM, switching it to incremental auto-vacuum"""
+        if engine.dialect.name != "sqlite":
+            return {"auto_vacuum": None}
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+        return {"auto_vacuum": PurgeService.ensure_auto_vacuum(engine)}
+
+    @staticmethod
+    def run_scheduled(db: Session) -> Dict[str, int]:
+        """Purge run by the scheduler with the configured retention"""
+        return PurgeService.purge(db, settings.purge_after_days or None)
@@ -0,0 +1,96 @@
+"""Write-coalescing buffer for read marks.
+
+Opening an article only queues (user, article) in memory; a background
+thread writes the queued marks with one set-based upsert per user every
+read_mark_flush_seconds, or sooner once read_mark_batch_size marks are
+waiting. The buffer is flushed when the app shuts down. When the flusher
+is not running (disabled, or outside the web app) marks are written at once.
+"""
+import threading
+import traceback
+from typing import Dict, Optional, Set
+from sqlalchemy import select
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Article
+from app.services.interaction import InteractionService
+
+
+class ReadMarkBuffer:
+    """Queues read marks and writes them in batches"""
+
+    def __init__(self):
+        self._pending: Dict[int, Set[int]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if settings.read_mark_flush_seconds <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="read-mark-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher and write whatever is still queued"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, user_id: int, article_id: int):
+        """Queue a read mark (written immediately when the flusher is not running)"""
+        with self._lock:
+            marks = self._pending.setdefault(user_id, set())
+            if article_id not in marks:
+                marks.add(article_id)
+                self._size += 1
+            full = self._size >= settings.read_mark_batch_size
+        if not self.running:
+            self.flush()
+        elif full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write the queued marks in one transaction; returns the number of interactions changed"""
+        with self._lock:
+            pending, self._pending, self._size = self._pending, {}, 0
+        if not pending:
+            return 0
+        db = SessionLocal()
+        try:
+            changed = 0
+            for user_id, article_ids in pending.items():
+                articles = select(Article.id).where(Article.id.in_(article_ids))
+                changed += InteractionService.apply(db, user_id, articles, {"is_read": True})
+            db.commit()
+            return changed
+        except Exception:
+            db.rollback()
+            print("[Read Marks Error]", traceback.format_exc())
+            # Keep the marks for the next flush
+            with self._lock:
+                for user_id, article_ids in pending.items():
+                    self._pending.setdefault(user_id, set()).update(article_ids)
+                self._size = sum(len(marks) for marks in self._pending.values())
+            return 0
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(settings.read_mark_flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+
+read_marks = ReadMarkBuffer()
@@ -0,0 +1,201 @@
+"""Background bulk rescoring jobs.
+
+Articles are streamed in id order, chunk by chunk. Each chunk is scored in a
+process pool and written back with bulk statements, then the job checkpoint
+(last article id) is committed so an interrupted job resumes where it stopped.
+"""
+import multiprocessing
+import os
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Article, ArticleKeyword, Feed, MaintenanceJob
+from app.services import UserService
+from app.services.archive import ArchiveService
+from app.services.article import ArticleService
+from app.services.statistics import StatsService
+from app.utils.scoring import KeywordMatcher, get_keyword_matcher
+
+
+@lru_cache(maxsize=64)
+def _matcher(keywords: tuple) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def score_batch(keywords: tuple, items: List[Tuple[int, str]]) -> List[Tuple[int, list]]:
+    """Score (article_id, text) items against one keyword set (runs in pool workers)"""
+    matcher = _matcher(keywords)
+    results = []
+    for article_id, text in items:
+        hits = [
+            (keyword_id, match_count, ArticleService._keyword_points(matcher.weights[keyword_id], match_count))
+            for keyword_id, match_count in matcher.count(text).items()
+        ]
+        results.append((article_id, hits))
+    return results
+
+
+class RescoreService:
+    """Service for background rescoring jobs"""
+
+    _threads: Dict[int, threading.Thread] = {}
+    _threads_lock = threading.Lock()
+
+    @staticmethod
+    def start_job(db: Session, created_by: Optional[str] = None) -> MaintenanceJob:
+        """Create and launch a rescore job, or return the one already in progress"""
+        active = db.query(MaintenanceJob).filter(
+            MaintenanceJob.kind == "rescore",
+            MaintenanceJob.status.in_(("pending", "running"))
+        ).first()
+        if active:
+            return active
+        job = MaintenanceJob(
+            kind="rescore",
+            status="pending",
+            created_by=created_by,
+            total=db.query(func.count(Article.id)).scalar() or 0
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        RescoreService.launch(job.id)
+        return job
+
+    @staticmethod
+    def launch(job_id: int) -> bool:
+        """Run a job on a background thread of this process"""
+        with RescoreService._threads_lock:
+            thread = RescoreService._threads.get(job_id)
+            if thread and thread.is_alive():
+                return False
+            thread = threading.Thread(target=RescoreService.run_job, args=(job_id,),
+                                      name=f"rescore-job-{job_id}", daemon=True)
+            RescoreService._threads[job_id] = thread
+            thread.start()
+            return True
+
+    @staticmethod
+    def resume_stale(db: Session) -> List[int]:
+        """Relaunch jobs whose worker stopped sending heartbeats (e.g. after a restart).
+
+        Pending jobs count too: the process may have died before their thread started.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.rescore_stale_seconds)
+        resumed = []
+        stale = db.query(MaintenanceJob).filter(
+            MaintenanceJob.kind == "rescore",
+            MaintenanceJob.status.in_(("pending", "running")),
+            MaintenanceJob.updated_at < cutoff
+        ).all()
+        for job in stale:
+            # Claim the job: only one process wins the conditional update
+            claimed = db.execute(
+                update(MaintenanceJob)
+                .where(MaintenanceJob.id == job.id, MaintenanceJob.status.in_(("pending", "running")),
+                       MaintenanceJob.updated_at < cutoff)
+                .values(updated_at=datetime.utcnow())
+            ).rowcount
+            db.commit()
+            if claimed and RescoreService.launch(job.id):
+                resumed.append(job.id)
+        return resumed
+
+    @staticmethod
+    def run_job(job_id: int):
+        """Process a job from its checkpoint until done, cancelled or failed"""
+        db = SessionLocal()
+        executor = None
+        job = None
+        try:
+            job = db.get(MaintenanceJob, job_id)
+            if job is None:
+                return
+            job.status = "running"
+            job.finished_at = None
+            db.commit()
+            workers = settings.rescore_workers or os.cpu_count() or 1
+            if workers > 1:
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            while True:
+                db.refresh(job)
+                if job.cancel_requested:
+                    job.status = "cancelled"
+                    break
+                rows = ArchiveService.with_bodies(db, (
+                    db.query(Article.id, Feed.user_id, Article.title, Article.description, Article.content,
+                             Article.is_archived)
+                    .join(Feed, Article.feed_id == Feed.id)
+                    .filter(Article.id > (job.checkpoint or 0))
+                    .order_by(Article.id)
+                    .limit(settings.rescore_chunk_size)
+                    .all()
+                ))
+                if not rows:
+                    job.status = "completed"
+                    break
+                results = RescoreService._score_rows(db, rows, executor, workers)
+                RescoreService._write_results(db, [row[0] for row in rows], results)
+                UserService.bump_data_version(db, {row[1] for row in rows})
+                job.checkpoint = rows[-1][0]
+                job.processed = (job.processed or 0) + len(rows)
+                db.commit()
+        except Exception as e:
+            print("[Rescore Job Error]", traceback.format_exc())
+            db.rollback()
+            job = db.get(MaintenanceJob, job_id)
+            job.status = "failed"
+            job.error_count = (job.error_count or 0) + 1
+            job.last_error = str(e)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if job is not None:
+                job.finished_at = datetime.utcnow()
+                db.commit()
+            db.close()
+
+    @staticmethod
+    def _score_rows(db: Session, rows: list, executor: Optional[ProcessPoolExecutor],
+                    workers: int) -> Dict[int, list]:
+        """Score a chunk of (id, user_id, title, description, content) rows"""
+        items_by_user: Dict[int, List[Tuple[int, str]]] = {}
+        for article_id, user_id, title, description, content in rows:
+            items_by_user.setdefault(user_id, []).append((article_id, f"{title} {description} {content}"))
+        batches = []
+        for user_id, items in items_by_user.items():
+            keywords = get_keyword_matcher(db, user_id).keywords
+            size = max(1, -(-len(items) // workers))
+            batches.extend((keywords, items[i:i + size]) for i in range(0, len(items), size))
+        if executor is None:
+            scored = [score_batch(keywords, items) for keywords, items in batches]
+        else:
+            futures = [executor.submit(score_batch, keywords, items) for keywords, items in batches]
+            scored = [future.result() for future in futures]
+        return {article_id: hits for batch in scored for article_id, hits in batch}
+
+    @staticmethod
+    def _write_results(db: Session, article_ids: List[int], results: Dict[int, list]):
+        """Replace the ArticleKeyword rows and base scores of a chunk with bulk statements"""
+        StatsService.add_keyword_matches(db, article_ids, sign=-1)
+        db.execute(delete(ArticleKeyword).where(ArticleKeyword.article_id.in_(article_ids)))
+        keyword_rows = [
+            {"article_id": article_id, "keyword_id": keyword_id, "match_count": match_count, "points": points}
+            for article_id, hits in results.items()
+            for keyword_id, match_count, points in hits
+        ]
+        if keyword_rows:
+            db.execute(insert(ArticleKeyword), keyword_rows)
+            StatsService.add_keyword_matches(db, article_ids)
+        db.execute(update(Article), [
+            {"id": article_id, "base_score": sum(points for _, _, points in results.get(article_id, []))}
+            for article_id in article_ids
+        ])
+        ArticleService.refresh_rank(db, article_ids)
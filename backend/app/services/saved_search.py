@@ -0,0 +1,79 @@
+from typing import Dict, List
+from sqlalchemy import delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+from app.models import Article, Feed, SavedSearch, SavedSearchMatch
+from app.services.search import SearchIndex
+from app.utils.search_query import QueryMatcher, index_words, parse_query
+
+
+class SavedSearchService:
+    """Service for saved searches, evaluated once per article at ingest (percolator)"""
+
+    @staticmethod
+    def percolate(db: Session, feed: Feed, articles: List[Article]) -> int:
+        """Record which active saved searches of the feed owner match new articles.
+
+        Each article is tokenized once and tested against every saved query
+        in Python. Articles must already have ids. Nothing is committed.
+        Returns the number of matches recorded.
+        """
+        if not articles:
+            return 0
+        searches = db.query(SavedSearch.id, SavedSearch.query).filter(
+            SavedSearch.user_id == feed.user_id,
+            SavedSearch.is_active == True,
+            or_(SavedSearch.feed_id == None, SavedSearch.feed_id == feed.id)
+        ).all()
+        matchers = []
+        for search_id, query in searches:
+            node = parse_query(query)
+            if node is not None:
+                matchers.append((search_id, QueryMatcher(node)))
+        if not matchers:
+            return 0
+        rows = []
+        for article in articles:
+            fields = [(text, index_words(text)) for text in (article.title, article.description, article.content) if text]
+            rows.extend(
+                {"saved_search_id": search_id, "article_id": article.id}
+                for search_id, matcher in matchers
+                if matcher.matches(fields)
+            )
+        if rows:
+            db.execute(insert(SavedSearchMatch), rows)
+        return len(rows)
+
+    @staticmethod
+    def backfill(db: Session, saved_search: SavedSearch) -> int:
+        """Recompute the matches of a saved search over existing articles (nothing is committed).
+
+        Runs once when a search is created or its query changes, through the
+        full-text index with a single INSERT ... SELECT.
+        """
+        db.execute(delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == saved_search.id))
+        node = parse_query(saved_search.query)
+        if node is None:
+            return 0
+        matching = (
+            select(literal(saved_search.id), Article.id)
+            .join(Feed, Article.feed_id == Feed.id)
+            .where(Feed.user_id == saved_search.user_id, SearchIndex.filter(node))
+        )
+        if saved_search.feed_id:
+            matching = matching.where(Article.feed_id == saved_search.feed_id)
+        result = db.execute(
+            insert(SavedSearchMatch).from_select(["saved_search_id", "article_id"], matching)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def match_counts(db: Session, search_ids: List[int]) -> Dict[int, int]:
+        """Number of recorded matches per saved search"""
+        if not search_ids:
+            return {}
+        return dict(
+            db.query(SavedSearchMatch.saved_search_id, func.count(SavedSearchMatch.id))
+            .filter(SavedSearchMatch.saved_search_id.in_(search_ids))
+            .group_by(SavedSearchMatch.saved_search_id)
+            .all()
+        )
@@ -0,0 +1,204 @@
+"""In-process background scheduler for feed synchronisation.
+
+Every worker process starts a SyncScheduler, but only the one holding the
+lock file actually polls feeds (and runs the periodic retention purge and
+archiving); the others keep retrying the lock so a new leader takes over if
+the current one exits.
+"""
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Article, Feed
+from app.services.archive import ArchiveService
+from app.services.feed import FeedService
+from app.services.purge import PurgeService
+from app.services.rescore import RescoreService
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+def next_sync_interval(current: Optional[int], recent_articles: int, got_new: bool) -> int:
+    """Compute the next polling interval (minutes) of a feed.
+
+    The estimate is the average gap between articles over the rate window.
+    Feeds that just produced new articles are polled at that rate; feeds that
+    returned nothing (304, no new entries or a failure) back off from their
+    current interval. The result is clamped to the configured floor/ceiling.
+    """
+    floor = settings.sync_min_interval_minutes
+    ceiling = settings.sync_max_interval_minutes
+    window = settings.sync_rate_window_days * 24 * 60
+    estimate = window / recent_articles if recent_articles else ceiling
+    if got_new:
+        interval = estimate
+    else:
+        interval = max(estimate, (current or floor) * settings.sync_backoff_factor)
+    return int(min(max(interval, floor), ceiling))
+
+
+class SyncScheduler:
+    """Polls due feeds on a background thread"""
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock_handle = None
+        self._next_runs: Dict[str, datetime] = {}
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sync-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+        self._release_lock()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_handle is not None
+
+    def _acquire_lock(self) -> bool:
+        """Try to become the scheduling worker (non-blocking)"""
+        if self._lock_handle is not None:
+            return True
+        if fcntl is None:
+            self._lock_handle = True
+            return True
+        handle = open(settings.scheduler_lock_file, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_handle = handle
+        return True
+
+    def _release_lock(self):
+        handle, self._lock_handle = self._lock_handle, None
+        if handle is not None and handle is not True:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+    def _run(self):
+        # First tick right away so a freshly started app catches up on due feeds
+        while not self._stop.is_set():
+            if self._acquire_lock():
+                try:
+                    self.run_once()
+                    self.resume_jobs()
+                    self.purge_if_due()
+                    self.archive_if_due()
+                except Exception:
+                    print("[Scheduler Error]", traceback.format_exc())
+            self._stop.wait(settings.scheduler_tick_seconds)
+
+    def resume_jobs(self) -> List[int]:
+        """Resume maintenance jobs interrupted by a restart"""
+        db = SessionLocal()
+        try:
+            return RescoreService.resume_stale(db)
+        finally:
+            db.close()
+
+    def _due(self, task: str, hours: float, wait_first: bool = False) -> bool:
+        """True (and the next run is planned) when a periodic task should run now.
+
+        With wait_first, the first run comes one full interval after the first check.
+        """
+        now = datetime.utcnow()
+        if hours <= 0:
+            return False
+        if wait_first and task not in self._next_runs:
+            self._next_runs[task] = now + timedelta(hours=hours)
+            return False
+        if now < self._next_runs.get(task, now):
+            return False
+        self._next_runs[task] = now + timedelta(hours=hours)
+        return True
+
+    def purge_if_due(self) -> Optional[Dict]:
+        """Run the retention purge once every purge_interval_hours.
+
+        Deleting is not undoable, so nothing is purged before a full interval
+        has passed since the scheduler started.
+        """
+        if not self._due("purge", settings.purge_interval_hours, wait_first=True):
+            return None
+        db = SessionLocal()
+        try:
+            return PurgeService.run_scheduled(db)
+        finally:
+            db.close()
+
+    def archive_if_due(self) -> Optional[Dict]:
+        """Move old article bodies to cold storage once every archive_interval_hours"""
+        if not self._due("archive", settings.archive_interval_hours):
+            return None
+        db = SessionLocal()
+        try:
+            return ArchiveService.run_scheduled(db)
+        finally:
+            db.close()
+
+    def run_once(self) -> List[Dict]:
+        """Sync every due feed once and reschedule it"""
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            feeds = (
+                db.query(Feed)
+                .filter(Feed.is_active == True, or_(Feed.next_sync_at == None, Feed.next_sync_at <= now))
+                .order_by(Feed.next_sync_at)
+                .limit(settings.scheduler_batch_size)
+                .all()
+            )
+            if not feeds:
+                return []
+            summaries = FeedService.sync_feeds(db, feeds)
+            SyncScheduler.reschedule(db, feeds, summaries)
+            return summaries
+        finally:
+            db.close()
+
+    @staticmethod
+    def reschedule(db: Session, feeds: List[Feed], summaries: List[Dict]):
+        """Store next_sync_at/sync_interval for synced feeds based on their results"""
+        feed_ids = [f.id for f in feeds]
+        since = datetime.utcnow() - timedelta(days=settings.sync_rate_window_days)
+        published = func.coalesce(Article.published_date, Article.created_at)
+        recent_counts = dict(
+            db.query(Article.feed_id, func.count(Article.id))
+            .filter(Article.feed_id.in_(feed_ids), published >= since)
+            .group_by(Article.feed_id)
+            .all()
+        )
+        by_id = {s["feed_id"]: s for s in summaries}
+        now = datetime.utcnow()
+        for feed in feeds:
+            summary = by_id.get(feed.id, {})
+            got_new = (
+                summary.get("status") == "success"
+                and summary.get("synced", 0) > 0
+                and not summary.get("not_modified")
+            )
+            interval = next_sync_interval(feed.sync_interval, recent_counts.get(feed.id, 0), got_new)
+            feed.sync_interval = interval
+            feed.next_sync_at = now + timedelta(minutes=interval)
+        db.commit()
+
+
+scheduler = SyncScheduler()
@@ -0,0 +1,224 @@
+"""Full-text index over article title, description and content.
+
+SQLite uses an external-content FTS5 table (articles_fts) kept in sync by
+triggers on the articles table, so inserts, edits and purges need no
+application code. Its content is the articles_search view, which reads the
+bodies of archived articles back from article_archives (SQL function
+archive_text, registered by app.database), so they stay searchable.
+PostgreSQL uses a GIN index on a tsvector expression.
+Other databases, or SQLite builds without FTS5, fall back to LIKE scans.
+"""
+import html
+import re
+import traceback
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Float, Integer, bindparam, column, func, literal_column, not_, or_, and_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Article
+from app.utils.search_query import is_indexable, to_fts5, to_tsquery
+
+def _indexed(row: str, field: str) -> str:
+    """SQL of the body text indexed for an articles row: its column, or the archived copy"""
+    return (f"CASE WHEN {row}.is_archived THEN (SELECT archive_text(codec, body, '{field}') "
+            f"FROM article_archives WHERE article_id = {row}.id) ELSE {row}.{field} END")
+
+
+# Rebuilt on every start (see ensure), so changes here reach existing databases
+_FTS5_TRIGGERS = {
+    "articles_fts_insert": """CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, description, content)
+        VALUES (new.id, new.title, new.description, new.content);
+    END""",
+    "articles_fts_delete": f"""CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, content)
+        VALUES ('delete', old.id, old.title, {_indexed('old', 'description')}, {_indexed('old', 'content')});
+    END""",
+    # Archiving moves the bodies without changing the indexed text: nothing to do then
+    "articles_fts_update": f"""CREATE TRIGGER articles_fts_update
+        AFTER UPDATE OF title, description, content, is_archived ON articles
+        WHEN NOT (new.is_archived AND NOT old.is_archived) BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, content)
+        VALUES ('delete', old.id, old.title, {_indexed('old', 'description')}, {_indexed('old', 'content')});
+        INSERT INTO articles_fts(rowid, title, description, content)
+        VALUES (new.id, new.title, {_indexed('new', 'description')}, {_indexed('new', 'content')});
+    END""",
+    # A purged archive takes its bodies out of the index; the article (if still there) keeps its title
+    "article_archives_fts_delete": """CREATE TRIGGER article_archives_fts_delete AFTER DELETE ON article_archives
+        WHEN (SELECT is_archived FROM articles WHERE id = old.article_id) BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, content)
+        SELECT 'delete', id, title, archive_text(old.codec, old.body, 'description'),
+               archive_text(old.codec, old.body, 'content')
+        FROM articles WHERE id = old.article_id;
+        INSERT INTO articles_fts(rowid, title, description, content)
+        SELECT id, title, NULL, NULL FROM articles WHERE id = old.article_id;
+    END""",
+}
+
+_FTS5_DDL = [
+    # What the index holds: archived bodies are read back from article_archives
+    f"""CREATE VIEW articles_search AS
+        SELECT id, title, {_indexed('articles', 'description')} AS description,
+               {_indexed('articles', 'content')} AS content
+        FROM articles""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, description, content,
+        content='articles_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    *_FTS5_TRIGGERS.values(),
+]
+
+_TEXT_SQL = "coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || coalesce(content, '')"
+_TSVECTOR_SQL = f"to_tsvector('simple', {_TEXT_SQL})"
+
+# Highlight delimiters used inside the database, turned into <mark> once the snippet is escaped
+_MARK_START, _MARK_END = "\x02", "\x03"
+_TAG_RE = re.compile(r"<[^>]*>|<[^>]*$|^[^<]*>")
+_MARK_RE = re.compile(_MARK_START + "([^" + _MARK_START + _MARK_END + "]*)" + _MARK_END)
+
+
+def _highlight(raw: str) -> str:
+    """Turn a raw index snippet (possibly cut inside HTML) into escaped text with <mark> highlights"""
+    plain = " ".join(html.unescape(_TAG_RE.sub(" ", raw)).split())
+    marked = _MARK_RE.sub(lambda m: "<mark>" + html.escape(m.group(1)) + "</mark>", plain)
+    # Escape what is outside the highlights; drop delimiters whose pair was cut off with a tag
+    parts = re.split(r"(<mark>.*?</mark>)", marked)
+    return "".join(
+        part if part.startswith("<mark>") else html.escape(part.replace(_MARK_START, "").replace(_MARK_END, ""))
+        for part in parts
+    )
+
+
+class SearchIndex:
+    """Creates the full-text index and compiles parsed queries against it"""
+
+    # "fts5", "postgresql" or None (LIKE fallback); set by ensure()
+    backend: Optional[str] = None
+
+    @staticmethod
+    def ensure(engine: Engine) -> Optional[str]:
+        """Create the index if needed (idempotent), filling it on first creation"""
+        dialect = engine.dialect.name
+        try:
+            with engine.begin() as conn:
+                if dialect == "sqlite":
+                    existing = conn.execute(text(
+                        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+                    )).scalar()
+                    # Views and triggers are recreated; an index over the bare articles table
+                    # (before archived bodies were indexed) is replaced and refilled
+                    for name in _FTS5_TRIGGERS:
+                        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+                    conn.execute(text("DROP VIEW IF EXISTS articles_search"))
+                    outdated = existing is not None and "articles_search" not in existing
+                    if outdated:
+                        conn.execute(text("DROP TABLE articles_fts"))
+                    for statement in _FTS5_DDL:
+                        conn.execute(text(statement))
+                    if existing is None or outdated:
+                        conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+                    SearchIndex.backend = "fts5"
+                elif dialect == "postgresql":
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_articles_search ON articles USING GIN ({_TSVECTOR_SQL})"
+                    ))
+                    SearchIndex.backend = "postgresql"
+        except Exception:
+            print("[Search Index Error] falling back to LIKE search:", traceback.format_exc())
+            SearchIndex.backend = None
+        return SearchIndex.backend
+
+    @staticmethod
+    def rebuild(db: Session):
+        """Rebuild the FTS5 table from the articles table (e.g. after restoring a backup)"""
+        if SearchIndex.backend == "fts5":
+            db.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+            db.commit()
+
+    @staticmethod
+    def filter(node: Tuple):
+        """SQL filter on Article for a parsed query (see app.utils.search_query)"""
+        if SearchIndex.backend == "fts5" and is_indexable(node):
+            positive, match = to_fts5(node)
+            rowids = text("SELECT rowid FROM articles_fts WHERE articles_fts MATCH :match").bindparams(
+                bindparam("match", match)
+            ).columns(column("rowid", Integer))
+            return Article.id.in_(rowids) if positive else Article.id.not_in(rowids)
+        if SearchIndex.backend == "postgresql" and is_indexable(node):
+            return literal_column(_TSVECTOR_SQL).op("@@")(func.to_tsquery("simple", to_tsquery(node)))
+        return SearchIndex._like_filter(node)
+
+    @staticmethod
+    def ranked(node: Tuple):
+        """Subquery of (id, relevance) over the articles matching a query, higher is better.
+
+        Returns None when the query cannot be ranked: no index, or a query
+        that only excludes terms. Callers then filter with filter() instead.
+        """
+        if not is_indexable(node):
+            return None
+        if SearchIndex.backend == "fts5":
+            positive, match = to_fts5(node)
+            if not positive:
+                return None
+            # bm25() is lower-is-better; weights are numbers from settings, safe to inline
+            weights = ", ".join(str(float(w)) for w in (list(settings.search_column_weights) + [1.0] * 3)[:3])
+            return text(
+                f"SELECT rowid AS id, -bm25(articles_fts, {weights}) AS relevance "
+                "FROM articles_fts WHERE articles_fts MATCH :match"
+            ).bindparams(bindparam("match", match)).columns(
+                column("id", Integer), column("relevance", Float)
+            ).subquery("search_matches")
+        if SearchIndex.backend == "postgresql":
+            vector = literal_column(_TSVECTOR_SQL)
+            tsquery = func.to_tsquery("simple", to_tsquery(node))
+            return select(
+                Article.id.label("id"), func.ts_rank_cd(vector, tsquery).label("relevance")
+            ).where(vector.op("@@")(tsquery)).subquery("search_matches")
+        return None
+
+    @staticmethod
+    def snippets(db: Session, node: Tuple, article_ids: List[int]) -> Dict[int, str]:
+        """Short highlighted extracts (escaped HTML with <mark>) for a page of matching articles"""
+        if not article_ids or not is_indexable(node):
+            return {}
+        tokens = max(1, min(settings.search_snippet_tokens, 64))
+        if SearchIndex.backend == "fts5":
+            positive, match = to_fts5(node)
+            if not positive:
+                return {}
+            rows = db.execute(
+                text(
+                    "SELECT rowid, snippet(articles_fts, -1, :start, :end, '…', :tokens) FROM articles_fts "
+                    "WHERE articles_fts MATCH :match AND rowid IN :ids"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"start": _MARK_START, "end": _MARK_END, "tokens": tokens, "match": match, "ids": article_ids}
+            ).all()
+        elif SearchIndex.backend == "postgresql":
+            options = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords={tokens}, MinWords={max(1, tokens // 2)}"
+            rows = db.execute(
+                select(Article.id, func.ts_headline("simple", literal_column(_TEXT_SQL),
+                                                    func.to_tsquery("simple", to_tsquery(node)), options))
+                .where(Article.id.in_(article_ids))
+            ).all()
+        else:
+            return {}
+        return {article_id: _highlight(raw) for article_id, raw in rows if raw}
+
+    @staticmethod
+    def _like_filter(node: Tuple):
+        """Substring filter used when no full-text index is available"""
+        kind = node[0]
+        if kind == "term":
+            pattern = f"%{node[1]}%"
+            return or_(
+                Article.title.ilike(pattern),
+                Article.description.ilike(pattern),
+                Article.content.ilike(pattern)
+            )
+        if kind == "not":
+            return not_(SearchIndex._like_filter(node[1]))
+        combine = and_ if kind == "and" else or_
+        return combine(SearchIndex._like_filter(node[1]), SearchIndex._like_filter(node[2]))
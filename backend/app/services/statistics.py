@@ -0,0 +1,185 @@
+"""Daily statistics rollups.
+
+keyword_daily_stats holds the keyword matches of the stored articles per
+keyword and publication day; article_daily_reads holds the reads of each
+article per day. Both are kept up to date by the code paths that change
+their sources (ingest, rescoring, read/unread, article deletion) with
+small grouped deltas, so the statistics endpoints aggregate a few rows per
+day instead of the whole history. rebuild() recomputes them from scratch;
+read days are then approximated by the interaction's last update.
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence
+from sqlalchemy import Date, bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import (
+    Article, ArticleDailyRead, ArticleKeyword, Feed, Keyword, KeywordDailyStat, UserArticleInteraction
+)
+
+
+def _article_day():
+    """Day the keyword matches of an article are counted on"""
+    return func.date(func.coalesce(Article.published_date, Article.created_at), type_=Date)
+
+
+class StatsService:
+    """Service for the daily statistics rollups"""
+
+    @staticmethod
+    def add_keyword_matches(db: Session, articles, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) the keyword matches of some articles.
+
+        `articles` is a list or a select of article ids. Call it after their
+        ArticleKeyword rows are written, or before they are deleted.
+        """
+        day = _article_day()
+        rows = db.execute(
+            select(Keyword.user_id, ArticleKeyword.keyword_id, day.label("day"),
+                   func.sum(ArticleKeyword.match_count))
+            .join(Keyword, Keyword.id == ArticleKeyword.keyword_id)
+            .join(Article, Article.id == ArticleKeyword.article_id)
+            .where(ArticleKeyword.article_id.in_(articles))
+            .group_by(Keyword.user_id, ArticleKeyword.keyword_id, day)
+        ).all()
+        StatsService._add(db, KeywordDailyStat, ("keyword_id", "day"), "match_count", [
+            {"user_id": user_id, "keyword_id": keyword_id, "day": day, "match_count": sign * (total or 0)}
+            for user_id, keyword_id, day, total in rows
+        ])
+
+    @staticmethod
+    def refresh_keyword(db: Session, keyword_id: int):
+        """Recompute the rollup of one keyword (after it was rescored or removed)"""
+        db.execute(delete(KeywordDailyStat).where(KeywordDailyStat.keyword_id == keyword_id))
+        db.execute(StatsService._keyword_rollup(ArticleKeyword.keyword_id == keyword_id))
+
+    @staticmethod
+    def record_reads(db: Session, user_id: int, articles, read: bool):
+        """Count the read state changes a user is about to make on a select of article ids.
+
+        Articles the user has not read yet get a read on today's row. Marking
+        an article unread takes that read back from its latest day, so the
+        total over all days stays the number of users who read it. Call it
+        before the interactions are written.
+        """
+        was_read = select(UserArticleInteraction.id).where(
+            UserArticleInteraction.user_id == user_id,
+            UserArticleInteraction.article_id == Article.id,
+            UserArticleInteraction.is_read == True
+        ).exists()
+        if read:
+            today = datetime.utcnow().date()
+            rows = db.execute(
+                select(Feed.user_id, Article.id)
+                .join(Feed, Feed.id == Article.feed_id)
+                .where(Article.id.in_(articles), ~was_read)
+            ).all()
+            StatsService._add(db, ArticleDailyRead, ("article_id", "day"), "read_count", [
+                {"user_id": owner_id, "article_id": article_id, "day": today, "read_count": 1}
+                for owner_id, article_id in rows
+            ])
+            return
+        latest = db.execute(
+            select(ArticleDailyRead.article_id, func.max(ArticleDailyRead.day))
+            .where(ArticleDailyRead.article_id.in_(select(Article.id).where(Article.id.in_(articles), was_read)),
+                   ArticleDailyRead.read_count > 0)
+            .group_by(ArticleDailyRead.article_id)
+        ).all()
+        if not latest:
+            return
+        table = ArticleDailyRead.__table__
+        db.execute(
+            update(table)
+            .where(table.c.article_id == bindparam("b_article_id"), table.c.day == bindparam("b_day"))
+            .values(read_count=table.c.read_count - 1),
+            [{"b_article_id": article_id, "b_day": day} for article_id, day in latest]
+        )
+        StatsService._drop_empty(db, ArticleDailyRead, "read_count", "article_id",
+                                 [article_id for article_id, _ in latest])
+
+    @staticmethod
+    def forget_articles(db: Session, articles):
+        """Remove articles (list or select of ids) from the rollups, before they are deleted"""
+        StatsService.add_keyword_matches(db, articles, sign=-1)
+        db.execute(
+            delete(ArticleDailyRead).where(ArticleDailyRead.article_id.in_(articles))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(db: Session) -> Dict[str, int]:
+        """Recompute both rollups from articles, keyword matches and interactions. Does not commit."""
+        db.execute(delete(KeywordDailyStat))
+        db.execute(delete(ArticleDailyRead))
+        db.execute(StatsService._keyword_rollup())
+        day = func.date(UserArticleInteraction.updated_at, type_=Date)
+        db.execute(insert(ArticleDailyRead).from_select(
+            ["user_id", "article_id", "day", "read_count"],
+            select(Feed.user_id, UserArticleInteraction.article_id, day, func.count(UserArticleInteraction.id))
+            .join(Article, Article.id == UserArticleInteraction.article_id)
+            .join(Feed, Feed.id == Article.feed_id)
+            .where(UserArticleInteraction.is_read == True)
+            .group_by(Feed.user_id, UserArticleInteraction.article_id, day)
+        ))
+        return {
+            "keyword_days": db.query(func.count(KeywordDailyStat.id)).scalar() or 0,
+            "read_days": db.query(func.count(ArticleDailyRead.id)).scalar() or 0,
+        }
+
+    @staticmethod
+    def backfill(db: Session) -> bool:
+        """Fill the rollups once when they are empty but their sources are not (first start after upgrading)"""
+        empty = db.query(KeywordDailyStat.id).first() is None and db.query(ArticleDailyRead.id).first() is None
+        if not empty or (db.query(ArticleKeyword.id).first() is None and db.query(UserArticleInteraction.id).filter(
+                UserArticleInteraction.is_read == True).first() is None):
+            return False
+        StatsService.rebuild(db)
+        db.commit()
+        return True
+
+    @staticmethod
+    def _keyword_rollup(*filters):
+        """INSERT ... SELECT of the keyword matches (restricted by `filters`) grouped per keyword and day"""
+        day = _article_day()
+        return insert(KeywordDailyStat).from_select(
+            ["user_id", "keyword_id", "day", "match_count"],
+            select(Keyword.user_id, ArticleKeyword.keyword_id, day, func.sum(ArticleKeyword.match_count))
+            .join(Keyword, Keyword.id == ArticleKeyword.keyword_id)
+            .join(Article, Article.id == ArticleKeyword.article_id)
+            .where(*filters)
+            .group_by(Keyword.user_id, ArticleKeyword.keyword_id, day)
+        )
+
+    @staticmethod
+    def _add(db: Session, model, keys: Sequence[str], count: str, rows: List[Dict]):
+        """Add the counts of `rows` to the rollup rows with the same keys, creating missing ones.
+
+        Rows left at zero or below (after removals) are deleted.
+        """
+        if not rows:
+            return
+        table = model.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            statement = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={count: table.c[count] + statement.excluded[count]}
+            ), rows)
+        else:
+            for row in rows:
+                updated = db.execute(
+                    update(table).where(*[table.c[key] == row[key] for key in keys])
+                    .values({count: table.c[count] + row[count]})
+                ).rowcount
+                if not updated:
+                    db.execute(insert(table).values(**row))
+        if any(row[count] < 0 for row in rows):
+            StatsService._drop_empty(db, model, count, keys[0], list({row[keys[0]] for row in rows}))
+
+    @staticmethod
+    def _drop_empty(db: Session, model, count: str, key: str, values: List):
+        """Delete the rollup rows of some keys whose count dropped to zero"""
+        table = model.__table__
+        for i in range(0, len(values), 500):
+            db.execute(delete(table).where(table.c[key].in_(values[i:i + 500]), table.c[count] <= 0))
@@ -1,7 +1,14 @@
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import jwt
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
 from app.config import settings
+from app.database import get_db
+from app.services import UserService
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
@@ -23,3 +30,74 @@ def verify_token(token: str) -> dict:
         return payload
     except jwt.InvalidTokenError:
         return None
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Snapshot of the authenticated user, safe to share between requests and sessions"""
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_admin: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user) -> "CurrentUser":
+        return cls(user.id, user.username, user.email, bool(user.is_active), bool(user.is_admin), user.created_at)
+
+
+# Token subject -> (expiry time, CurrentUser), see load_user
+_user_cache: Dict[str, Tuple[float, CurrentUser]] = {}
+_user_cache_lock = threading.Lock()
+_USER_CACHE_MAX = 1024
+
+
+def load_user(db: Session, subject: str) -> Optional[CurrentUser]:
+    """User named by a token subject, from the cache when it is fresh enough"""
+    now = time.monotonic()
+    cached = _user_cache.get(subject)
+    if cached and cached[0] > now:
+        return cached[1]
+    user = UserService.get_user_by_username(db, subject)
+    if not user:
+        return None
+    snapshot = CurrentUser.from_user(user)
+    if settings.auth_cache_ttl_seconds > 0:
+        with _user_cache_lock:
+            if len(_user_cache) >= _USER_CACHE_MAX:
+                for key in [key for key, (expires, _) in _user_cache.items() if expires <= now] or list(_user_cache):
+                    del _user_cache[key]
+            _user_cache[subject] = (now + settings.auth_cache_ttl_seconds, snapshot)
+    return snapshot
+
+
+def forget_user(user_id: int):
+    """Drop a user from the cache (call after the user is updated or deleted)"""
+    with _user_cache_lock:
+        for key in [key for key, (_, cached) in _user_cache.items() if cached.id == user_id]:
+            del _user_cache[key]
+
+
+def _token_subject(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    payload = verify_token(authorization.replace("Bearer ", ""))
+    return payload.get("sub") if payload else None
+
+
+def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> CurrentUser:
+    """Dependency: the authenticated user, 401 without a valid token"""
+    subject = _token_subject(authorization)
+    if not subject:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = load_user(db, subject)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
+def get_optional_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> Optional[CurrentUser]:
+    """Dependency: the authenticated user, or None for anonymous or invalid credentials"""
+    subject = _token_subject(authorization)
+    return load_user(db, subject) if subject else None
@@ -0,0 +1,50 @@
+"""Codecs of the article archive (see app.services.archive).
+
+A body is stored as compressed JSON: zlib, zstd when the optional zstandard
+package is installed, or "none" when compressing does not pay off.
+archive_text() is also registered as an SQL function on SQLite connections
+(app.database), so the full-text index can read archived bodies.
+"""
+import json
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is used instead
+    zstandard = None
+
+
+def compress(data: bytes, codec: str) -> Tuple[bytes, str]:
+    """Compressed `data` and the codec actually used ("none" when compressing does not pay off)"""
+    if codec == "zstd":
+        blob = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        blob = zlib.compress(data, 6)
+    return (blob, codec) if len(blob) < len(data) else (data, "none")
+
+
+def decompress(blob: bytes, codec: str) -> Dict[str, Optional[str]]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Article archived with zstd: install the zstandard package to read it")
+        data = zstandard.ZstdDecompressor().decompress(blob)
+    elif codec == "none":
+        data = blob
+    else:
+        data = zlib.decompress(blob)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=64)
+def _cached(blob: bytes, codec: str) -> Dict[str, Optional[str]]:
+    # The index asks for each field of a row in turn: decompress the row once
+    return decompress(blob, codec)
+
+
+def archive_text(codec: Optional[str], blob: Optional[bytes], field: str) -> Optional[str]:
+    """One field of an archived body; SQL function archive_text(codec, body, field)"""
+    if blob is None:
+        return None
+    return _cached(bytes(blob), codec).get(field)
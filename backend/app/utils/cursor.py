@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+
+def encode_cursor(kind: str, key: List[Any], now: Optional[datetime] = None) -> str:
+    """Encode a page position (sort kind, last row's sort key) as an opaque URL-safe token"""
+    payload = {
+        "k": kind,
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in key],
+    }
+    if now is not None:
+        payload["n"] = now.isoformat()
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, types: Tuple[type, ...]) -> Tuple[List[Any], Optional[datetime]]:
+    """Decode a token from encode_cursor into (key, now).
+
+    `types` gives the type of each key value (datetime values are parsed
+    back from ISO strings). Raises ValueError for malformed tokens or
+    tokens issued for a different sort.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload.get("k") != kind or len(payload["v"]) != len(types):
+            raise ValueError("cursor does not match this sort order")
+        key = [
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(payload["v"], types)
+        ]
+        now = datetime.fromisoformat(payload["n"]) if payload.get("n") else None
+    except (TypeError, KeyError, AttributeError, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+    return key, now
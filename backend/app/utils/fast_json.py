@@ -0,0 +1,27 @@
+"""Fast JSON responses.
+
+Uses orjson when it is installed and falls back to the standard json module
+with the same compact output as FastAPI's JSONResponse otherwise.
+"""
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content)
+
+except ImportError:  # pragma: no cover - optional dependency
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse for content that is already JSON-ready (no pydantic pass)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
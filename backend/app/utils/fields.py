@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# Datetime format used by the response schemas' field serializers
+DATETIME_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str],
+                 presets: Optional[Dict[str, Iterable[str]]] = None) -> Optional[List[str]]:
+    """Parse a comma-separated `fields` parameter.
+
+    Names may be response fields from `allowed` or preset names (e.g.
+    "summary"). Returns the selected fields in `allowed` order, or None
+    when the parameter is empty (all fields). Raises ValueError for
+    unknown names.
+    """
+    if not fields:
+        return None
+    selected = set()
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        if presets and name in presets:
+            selected.update(presets[name])
+        elif name in allowed:
+            selected.add(name)
+        else:
+            raise ValueError(f"Unknown field: {name}")
+    return [name for name in allowed if name in selected]
+
+
+_SCHEMA_INFO: Dict[Any, Tuple[FrozenSet[str], Dict[str, Any]]] = {}
+
+
+def schema_info(model) -> Tuple[FrozenSet[str], Dict[str, Any]]:
+    """(float field names, field defaults) of a pydantic response model, cached"""
+    info = _SCHEMA_INFO.get(model)
+    if info is None:
+        floats = frozenset(
+            name for name, field in model.model_fields.items()
+            if field.annotation is float or field.annotation == Optional[float]
+        )
+        defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in model.model_fields.items() if not field.is_required()
+        }
+        info = _SCHEMA_INFO[model] = (floats, defaults)
+    return info
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime(DATETIME_FORMAT)
+    return value
+
+
+def project(item: Any, fields: Sequence[str], model=None) -> Dict[str, Any]:
+    """JSON-ready dict of the selected fields of an object or dict.
+
+    With `model`, produces what that response schema would serialize for
+    trusted data (missing fields get their defaults, ints in float fields
+    become floats) without running validation. Datetimes are formatted
+    with DATETIME_FORMAT.
+    """
+    floats, defaults = schema_info(model) if model is not None else (frozenset(), {})
+    if isinstance(item, dict):
+        get = lambda name: item.get(name, defaults.get(name))
+    else:
+        get = lambda name: getattr(item, name, defaults.get(name))
+    result = {}
+    for name in fields:
+        value = get(name)
+        if name in floats and value is not None:
+            value = float(value)
+        result[name] = _json_value(value)
+    return result
@@ -1,8 +1,134 @@
 import re
-from typing import List, Set
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
 from sqlalchemy.orm import Session
 from app.models import Keyword
 
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex alternation shaped as a prefix trie (longest alternative first)"""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Term ends here but longer terms continue: try the longer ones first
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Matches a set of keywords against text in a single regex pass.
+    Gives the same counts as a case-insensitive whole-word findall per
+    keyword, including keywords that overlap each other.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[int, str, float]]):
+        self.keywords = tuple(keywords)
+        self.weights: Dict[int, float] = {}
+        self._ids_by_term: Dict[str, List[int]] = {}
+        # Keywords whose lowercase form has another length (e.g. 'İ') are matched on their own
+        self._irregular: Dict[str, List[int]] = {}
+        for keyword_id, keyword, weight in self.keywords:
+            self.weights[keyword_id] = weight
+            if not keyword:
+                continue
+            if len(keyword.lower()) == len(keyword):
+                self._ids_by_term.setdefault(keyword.lower(), []).append(keyword_id)
+            else:
+                self._irregular.setdefault(keyword, []).append(keyword_id)
+        terms = sorted(self._ids_by_term)
+        self._single = {t: re.compile(r'\b' + re.escape(t) + r'\b', re.IGNORECASE) for t in terms}
+        # Shorter terms that may match at the same position as a longer one
+        self._prefixes = {t: [p for p in terms if p != t and t.startswith(p)] for t in terms}
+        self._pattern = re.compile(r'\b(?=(' + _trie_pattern(terms) + r')\b)', re.IGNORECASE) if terms else None
+        self._irregular_patterns = {
+            k: re.compile(r'\b' + re.escape(k) + r'\b', re.IGNORECASE) for k in self._irregular
+        }
+
+    def count(self, text: str) -> Dict[int, int]:
+        """Return keyword_id -> match count for text"""
+        if not text:
+            return {}
+        term_counts: Dict[str, int] = {}
+        last_end: Dict[str, int] = {}
+
+        def record(term: str, start: int, end: int):
+            # Like re.findall, occurrences of one keyword never overlap
+            if start >= last_end.get(term, 0):
+                term_counts[term] = term_counts.get(term, 0) + 1
+                last_end[term] = end
+
+        for m in (self._pattern.finditer(text) if self._pattern is not None else ()):
+            start = m.start()
+            term = m.group(1).lower()
+            if term not in self._single:
+                # Case folding changed the length (rare Unicode cases): resolve by testing each term
+                for candidate, pattern in self._single.items():
+                    hit = pattern.match(text, start)
+                    if hit:
+                        record(candidate, start, hit.end())
+                continue
+            record(term, start, start + len(m.group(1)))
+            for prefix in self._prefixes[term]:
+                hit = self._single[prefix].match(text, start)
+                if hit:
+                    record(prefix, start, hit.end())
+
+        matches = {}
+        for term, count in term_counts.items():
+            for keyword_id in self._ids_by_term[term]:
+                matches[keyword_id] = count
+        for keyword, pattern in self._irregular_patterns.items():
+            count = len(pattern.findall(text))
+            if count:
+                for keyword_id in self._irregular[keyword]:
+                    matches[keyword_id] = count
+        return matches
+
+
+_matcher_cache: Dict[int, KeywordMatcher] = {}
+_matcher_cache_lock = threading.Lock()
+
+
+def get_keyword_matcher(db: Session, user_id: int) -> KeywordMatcher:
+    """
+    Return the compiled matcher for a user's active keywords.
+    Matchers are cached per user; the cache entry is rebuilt when the
+    keyword set differs from the cached one (e.g. changed in another worker).
+    """
+    keywords = tuple(
+        db.query(Keyword.id, Keyword.keyword, Keyword.weight)
+        .filter(Keyword.user_id == user_id, Keyword.is_active == True)
+        .order_by(Keyword.id)
+        .all()
+    )
+    keywords = tuple(tuple(k) for k in keywords)
+    matcher = _matcher_cache.get(user_id)
+    if matcher is None or matcher.keywords != keywords:
+        matcher = KeywordMatcher(keywords)
+        with _matcher_cache_lock:
+            _matcher_cache[user_id] = matcher
+    return matcher
+
+
+def invalidate_keyword_matcher(user_id: int):
+    """Drop the cached matcher of a user (call after keyword changes)"""
+    with _matcher_cache_lock:
+        _matcher_cache.pop(user_id, None)
+
+
 def extract_keywords_from_text(text: str, keywords: List[Keyword]) -> dict:
     """
     Extract keyword matches from text.
@@ -10,18 +136,8 @@ def extract_keywords_from_text(text: str, keywords: List[Keyword]) -> dict:
     """
     if not text or not keywords:
         return {}
-    
-    # Use re.IGNORECASE for robust case-insensitive matching
-    matches = {}
-    for keyword in keywords:
-        if not keyword.is_active:
-            continue
-        # Use word boundaries for whole word matching, ignore case
-        pattern = r'\b' + re.escape(keyword.keyword) + r'\b'
-        count = len(re.findall(pattern, text, flags=re.IGNORECASE))
-        if count > 0:
-            matches[keyword.id] = count
-    return matches
+    matcher = KeywordMatcher((k.id, k.keyword, k.weight) for k in keywords if k.is_active)
+    return matcher.count(text)
 
 def calculate_article_score(article_id: int, db: Session) -> float:
     """
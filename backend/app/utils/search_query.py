@@ -0,0 +1,167 @@
+"""Boolean search query parsing and evaluation.
+
+Queries support quoted phrases, AND, OR, NOT and parentheses. AND and OR
+have the same precedence and apply left to right; terms written next to
+each other are ANDed. The parsed tree is a nested tuple:
+
+    ("term", text)  ("not", node)  ("and", left, right)  ("or", left, right)
+"""
+import re
+import unicodedata
+from typing import List, Optional, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r'"[^"]+"|\(|\)|\bAND\b|\bOR\b|\bNOT\b|[^\s()]+', re.IGNORECASE)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(query: str) -> List[str]:
+    """Split a query into quoted phrases, words, operators and parentheses"""
+    return _TOKEN_RE.findall(query)
+
+
+def parse_query(query: str) -> Optional[Tuple]:
+    """Parse a search query into a tree, None when it has no terms"""
+    tokens = tokenize(query)
+
+    def parse_atom():
+        token = tokens.pop(0)
+        if token == "(":
+            expr = parse_expr() if tokens and tokens[0] != ")" else None
+            if tokens and tokens[0] == ")":
+                tokens.pop(0)
+            return expr
+        if token.upper() == "NOT":
+            operand = parse_atom() if tokens else None
+            return ("not", operand) if operand is not None else None
+        if token.startswith('"') and token.endswith('"') and len(token) > 1:
+            return ("term", token[1:-1])
+        return ("term", token)
+
+    def combine(op, left, right):
+        if left is None or right is None:
+            return left if right is None else right
+        return (op, left, right)
+
+    def parse_expr():
+        expr = parse_atom()
+        while tokens and tokens[0] != ")":
+            op = "and"
+            if tokens[0].upper() in ("AND", "OR"):
+                op = tokens.pop(0).lower()
+                if not tokens or tokens[0] == ")":
+                    break
+            expr = combine(op, expr, parse_atom())
+        return expr
+
+    expr = None
+    while tokens:
+        if tokens[0] == ")":
+            # Unbalanced closing parenthesis
+            tokens.pop(0)
+            continue
+        expr = combine("and", expr, parse_expr())
+    return expr
+
+
+def is_indexable(node: Tuple) -> bool:
+    """True when every term contains a word character (punctuation-only terms are not indexed)"""
+    if node[0] == "term":
+        return _WORD_RE.search(node[1]) is not None
+    return all(is_indexable(child) for child in node[1:])
+
+
+def to_fts5(node: Tuple) -> Tuple[bool, str]:
+    """Compile a parsed query to an FTS5 MATCH expression.
+
+    FTS5 has no unary NOT, so the result is (positive, expression): when
+    positive is False the expression matches the rows to exclude. Every
+    term is a prefix query, the closest match to the substring search the
+    LIKE fallback does.
+    """
+    kind = node[0]
+    if kind == "term":
+        return True, '"' + node[1].replace('"', '""') + '"*'
+    if kind == "not":
+        positive, expr = to_fts5(node[1])
+        return not positive, expr
+    left_pos, left = to_fts5(node[1])
+    right_pos, right = to_fts5(node[2])
+    if kind == "and":
+        if left_pos and right_pos:
+            return True, f"({left}) AND ({right})"
+        if left_pos:
+            return True, f"({left}) NOT ({right})"
+        if right_pos:
+            return True, f"({right}) NOT ({left})"
+        return False, f"({left}) OR ({right})"
+    if left_pos and right_pos:
+        return True, f"({left}) OR ({right})"
+    if left_pos:
+        # a OR NOT b == NOT (b NOT a)
+        return False, f"({right}) NOT ({left})"
+    if right_pos:
+        return False, f"({left}) NOT ({right})"
+    return False, f"({left}) AND ({right})"
+
+
+def to_tsquery(node: Tuple) -> str:
+    """Compile a parsed query to a PostgreSQL tsquery (prefix-matching terms)"""
+    kind = node[0]
+    if kind == "term":
+        words = _WORD_RE.findall(node[1].lower())
+        lexemes = ["'" + word + "'" for word in words]
+        lexemes[-1] += ":*"
+        return "(" + " <-> ".join(lexemes) + ")"
+    if kind == "not":
+        return "!" + to_tsquery(node[1])
+    op = " & " if kind == "and" else " | "
+    return "(" + to_tsquery(node[1]) + op + to_tsquery(node[2]) + ")"
+
+
+def index_words(text: str) -> List[str]:
+    """Split text into words the way the full-text index does (lowercase, no diacritics)"""
+    folded = "".join(
+        char for char in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(char)
+    )
+    return _WORD_RE.findall(folded)
+
+
+class QueryMatcher:
+    """Evaluates a parsed query against one document in Python.
+
+    Mirrors the index semantics (prefix terms, phrases within one field)
+    so saved searches can be tested against new articles without a
+    database query. Documents are lists of fields, each given as
+    (raw text, index_words(raw text)).
+    """
+
+    def __init__(self, node: Tuple):
+        self.node = node
+
+    def matches(self, fields: Sequence[Tuple[str, List[str]]]) -> bool:
+        return self._eval(self.node, fields)
+
+    def _eval(self, node: Tuple, fields) -> bool:
+        kind = node[0]
+        if kind == "term":
+            return self._term(node[1], fields)
+        if kind == "not":
+            return not self._eval(node[1], fields)
+        if kind == "and":
+            return self._eval(node[1], fields) and self._eval(node[2], fields)
+        return self._eval(node[1], fields) or self._eval(node[2], fields)
+
+    @staticmethod
+    def _term(term: str, fields) -> bool:
+        words = index_words(term)
+        if not words:
+            # Not indexable: substring match, like the LIKE fallback
+            needle = term.lower()
+            return any(needle in raw.lower() for raw, _ in fields)
+        *head, last = words
+        size = len(words)
+        for _, field_words in fields:
+            for i in range(len(field_words) - size + 1):
+                if field_words[i + size - 1].startswith(last) and field_words[i:i + size - 1] == head:
+                    return True
+        return False
@@ -2,16 +2,28 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.config import settings
-from app.database import Base, engine
-from app.routes import auth_router, feeds_router, keywords_router, articles_router, config_router, users_router
+from app.database import Base, SessionLocal, engine
+from app.routes import auth_router, feeds_router, keywords_router, articles_router, config_router, users_router, saved_searches_router
 from app.routes.openai import router as openai_router
 from app.routes.statistics import router as statistics_router
 from app.routes.maintenance import router as maintenance_router
+from app.services.scheduler import scheduler
+from app.services.read_marks import read_marks
+from app.services.purge import PurgeService
+from app.services.search import SearchIndex
+from app.services.statistics import StatsService
 # Import models to register them with Base
 from app.models import User, Feed, Keyword, Article, ArticleKeyword, UserArticleInteraction
 
+# New SQLite files use incremental auto-vacuum, so purges can give space back
+PurgeService.ensure_auto_vacuum(engine)
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# Create the full-text search index (FTS5 on SQLite)
+SearchIndex.ensure(engine)
+# Fill the statistics rollups on the first start after they were added
+with SessionLocal() as db:
+    StatsService.backfill(db)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -39,11 +52,25 @@ app.include_router(keywords_router, prefix="/api")
 app.include_router(articles_router, prefix="/api")
 app.include_router(config_router, prefix="/api")
 app.include_router(users_router, prefix="/api")
+app.include_router(saved_searches_router, prefix="/api")
 
 app.include_router(maintenance_router, prefix="/api")
 app.include_router(statistics_router, prefix="/api")
 app.include_router(openai_router, prefix="/api")
 
+@app.on_event("startup")
+def start_scheduler():
+    """Start the background feed sync scheduler and the read mark flusher"""
+    if settings.scheduler_enabled:
+        scheduler.start()
+    read_marks.start()
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+    # Write the read marks still queued
+    read_marks.stop()
+
 @app.get("/")
 def root():
     """Health check endpoint"""
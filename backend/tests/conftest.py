@@ -0,0 +1,47 @@
+"""Shared fixtures: the app on a throwaway SQLite database, and logged-in users."""
+import itertools
+import os
+import sys
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="techwatch-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'tech_watch.db')}"
+os.environ["SCHEDULER_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+_usernames = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization headers of a newly registered user"""
+    username = f"user{next(_usernames)}"
+    client.post("/api/auth/register", json={"username": username, "email": f"{username}@example.com",
+                                            "password": "secret"})
+    token = client.post("/api/auth/login", json={"username": username, "password": "secret"}).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+@pytest.fixture
+def add_feed(client, monkeypatch):
+    """Create a feed for a user and sync the given article entries into it; returns the feed id"""
+    from app.services.feed import FeedService
+
+    def add(headers, entries, name="Feed"):
+        feed_id = client.post("/api/feeds/", json={"name": name, "url": f"http://example.com/{name}"},
+                              headers=headers).json()["id"]
+        monkeypatch.setattr(FeedService, "fetch", staticmethod(lambda *args: {"articles": entries}))
+        assert client.post(f"/api/feeds/{feed_id}/sync/", headers=headers).status_code == 200
+        return feed_id
+
+    return add
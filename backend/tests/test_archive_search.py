@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+
+from app.database import SessionLocal
+from app.models import Article, ArticleArchive
+from app.services.archive import ArchiveService
+from app.services.purge import PurgeService
+from app.services.search import SearchIndex
+
+
+def _archive_old(client, auth_headers, add_feed, word):
+    old = datetime.utcnow() - timedelta(days=400)
+    add_feed(auth_headers, [{
+        "title": f"Old post {i}", "url": f"http://example.com/{word}/{i}", "published_date": old,
+        "description": f"The {word} release notes", "content": f"Details about {word} and more {i}",
+    } for i in range(3)], name=word)
+    with SessionLocal() as db:
+        assert ArchiveService.archive(db, days=300)["archived_articles"] >= 3
+        archived = db.query(Article).filter(Article.url.like(f"http://example.com/{word}/%")).all()
+        assert all(article.is_archived and article.description is None for article in archived)
+
+
+def _search(client, auth_headers, query):
+    return client.get(f"/api/articles/search?query={query}", headers=auth_headers).json()
+
+
+def _integrity_check():
+    with SessionLocal() as db:
+        db.execute(text("INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)"))
+
+
+def test_archived_bodies_stay_searchable(client, auth_headers, add_feed):
+    _archive_old(client, auth_headers, add_feed, "zephyrine")
+    results = _search(client, auth_headers, "zephyrine")
+    assert len(results) == 3
+    assert all("zephyrine" in result["snippet"] for result in results)
+    assert all("zephyrine" in result["description"] for result in results)
+    _integrity_check()
+
+    with SessionLocal() as db:
+        SearchIndex.rebuild(db)
+        db.commit()
+    assert len(_search(client, auth_headers, "zephyrine")) == 3
+    _integrity_check()
+
+
+def test_saved_search_backfill_matches_archived_bodies(client, auth_headers, add_feed):
+    _archive_old(client, auth_headers, add_feed, "quillwort")
+    saved = client.post("/api/saved_searches/", json={"name": "Quillwort", "query": "quillwort"},
+                        headers=auth_headers).json()
+    assert saved["match_count"] == 3
+
+
+def test_index_follows_deleted_archives_and_articles(client, auth_headers, add_feed):
+    _archive_old(client, auth_headers, add_feed, "brimstoneq")
+    with SessionLocal() as db:
+        ids = [article_id for (article_id,) in db.query(Article.id).filter(
+            Article.url.like("http://example.com/brimstoneq/%")).order_by(Article.id)]
+        # A lost archive takes the bodies out of the index, the title stays
+        db.execute(delete(ArticleArchive).where(ArticleArchive.article_id == ids[0]))
+        db.execute(delete(Article).where(Article.id == ids[1]))
+        db.commit()
+    assert [result["id"] for result in _search(client, auth_headers, "brimstoneq")] == [ids[2]]
+    assert [result["id"] for result in _search(client, auth_headers, "%22Old post 0%22")] == [ids[0]]
+    _integrity_check()
+
+    with SessionLocal() as db:
+        PurgeService.purge(db, days=300)
+    assert _search(client, auth_headers, "brimstoneq") == []
+    _integrity_check()
@@ -0,0 +1,135 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, desc, event
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Article, Feed, MaintenanceJob, UserArticleInteraction
+from app.services.article import ArticleService
+from app.services.rescore import RescoreService
+
+WORDS = ["python", "rust", "golang", "news"]
+
+
+def _entries(prefix, count, now):
+    rng = random.Random(prefix)
+    return [{
+        "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))),
+        "url": f"http://example.com/{prefix}/{i}",
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6))),
+        "published_date": now - timedelta(hours=rng.uniform(-12, 24 * 60)),
+    } for i in range(count)]
+
+
+def _setup(client, auth_headers, add_feed):
+    now = datetime.utcnow()
+    for keyword, weight in [("python", 3), ("rust", 2), ("golang", 1)]:
+        client.post("/api/keywords/", json={"keyword": keyword, "weight": weight}, headers=auth_headers)
+    feed_ids = [add_feed(auth_headers, _entries(f"{name}{id(auth_headers)}", 150, now), name=f"{name}{id(auth_headers)}")
+                for name in ("ranked", "other")]
+    ids = [a["id"] for a in client.get("/api/articles/?limit=1000&fields=id", headers=auth_headers).json()]
+    for article_id in ids[::9]:
+        client.post(f"/api/articles/{article_id}/like/", headers=auth_headers)
+    return feed_ids
+
+
+def _expected(feed_ids, feed_id=None):
+    """Order of the same articles when every total_score is computed and sorted in SQL"""
+    with SessionLocal() as db:
+        _, _, _, total_score = ArticleService._score_columns(db, datetime.utcnow())
+        query = (
+            db.query(Article.id)
+            .join(Feed, Feed.id == Article.feed_id)
+            .outerjoin(UserArticleInteraction, and_(UserArticleInteraction.article_id == Article.id,
+                                                    UserArticleInteraction.user_id == Feed.user_id))
+            .filter(Article.feed_id.in_([feed_id] if feed_id else feed_ids))
+        )
+        return [article_id for (article_id,) in query.order_by(
+            desc(total_score), desc(Article.created_at), desc(Article.id))]
+
+
+def _paged(client, headers, query="", limit=7):
+    """Ids of the score listing, fetched page by page with cursors (small pages exercise the index walk)"""
+    ids, cursor = [], None
+    while True:
+        url = f"/api/articles/?limit={limit}&fields=id{query}" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        ids += [a["id"] for a in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+
+
+def test_score_order_matches_full_sort(client, auth_headers, add_feed):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    expected = _expected(feed_ids)
+    listed = [a["id"] for a in client.get("/api/articles/?limit=1000&fields=id", headers=auth_headers).json()]
+    assert listed == expected
+    assert _paged(client, auth_headers) == expected
+
+    offset_page = client.get("/api/articles/?limit=10&offset=25&fields=id", headers=auth_headers).json()
+    assert [a["id"] for a in offset_page] == expected[25:35]
+
+    assert _paged(client, auth_headers, f"&feed_id={feed_ids[0]}") == _expected(feed_ids, feed_ids[0])
+
+
+def test_unlike_moves_article_down(client, auth_headers, add_feed):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    liked = client.get("/api/articles/?limit=1000&fields=id,user_boost_score", headers=auth_headers).json()
+    article_id = next(a["id"] for a in liked if a["user_boost_score"])
+    client.post(f"/api/articles/{article_id}/unlike/", headers=auth_headers)
+    assert _paged(client, auth_headers) == _expected(feed_ids)
+
+
+def test_score_listing_walks_the_rank_index(client, auth_headers, add_feed):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "ORDER BY articles.rank_score DESC" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        client.get("/api/articles/?limit=20", headers=auth_headers)
+        client.get(f"/api/articles/?limit=20&feed_id={feed_ids[1]}", headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert len(statements) >= 2
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = " | ".join(row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+            assert "rank_score" in plan, (statement, plan)
+            assert "TEMP B-TREE" not in plan, (statement, plan)
+
+
+def test_keyword_change_keeps_order_exact(client, auth_headers, add_feed):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    keyword = next(k for k in client.get("/api/keywords/", headers=auth_headers).json() if k["keyword"] == "golang")
+    client.put(f"/api/keywords/{keyword['id']}", json={"weight": 30}, headers=auth_headers)
+    assert _paged(client, auth_headers) == _expected(feed_ids)
+
+
+def test_new_keyword_lifts_an_old_article_to_the_top(client, auth_headers, add_feed):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    old = {"title": "A forgotten scoop", "url": f"http://example.com/scoop/{id(auth_headers)}",
+           "published_date": datetime.utcnow() - timedelta(days=59)}
+    feed_ids.append(add_feed(auth_headers, [old], name=f"scoop{id(auth_headers)}"))
+    client.post("/api/keywords/", json={"keyword": "scoop", "weight": 100}, headers=auth_headers)
+    first_page = [a["id"] for a in client.get("/api/articles/?limit=5&fields=id", headers=auth_headers).json()]
+    assert first_page == _expected(feed_ids)[:5]
+    assert _paged(client, auth_headers) == _expected(feed_ids)
+
+
+def test_rescore_job_rebuilds_rank_scores(client, auth_headers, add_feed, monkeypatch):
+    feed_ids = _setup(client, auth_headers, add_feed)
+    with SessionLocal() as db:
+        db.query(Article).filter(Article.feed_id.in_(feed_ids)).update({"rank_score": 0.0}, synchronize_session=False)
+        job = MaintenanceJob(kind="rescore", status="pending", total=0)
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    monkeypatch.setattr(settings, "rescore_workers", 1)
+    RescoreService.run_job(job_id)
+    assert _paged(client, auth_headers) == _expected(feed_ids)
@@ -0,0 +1,42 @@
+from app.services.feed import FeedService
+
+
+def _sync(client, headers, feed_id, monkeypatch, result):
+    monkeypatch.setattr(FeedService, "fetch", staticmethod(lambda *args: result))
+    return client.post(f"/api/feeds/{feed_id}/sync/", headers=headers)
+
+
+def _count_etag(client, headers):
+    return client.get("/api/articles/count", headers=headers).headers["etag"]
+
+
+def test_not_modified_sync_keeps_listing_etag(client, auth_headers, monkeypatch):
+    feed_id = client.post("/api/feeds/", json={"name": "Blog", "url": "http://example.com/rss"},
+                          headers=auth_headers).json()["id"]
+    article = {"title": "Hello", "url": "http://example.com/hello", "description": "Hello world"}
+    assert _sync(client, auth_headers, feed_id, monkeypatch,
+                 {"articles": [article], "etag": '"v1"', "modified": None}).status_code == 200
+    new_articles = _count_etag(client, auth_headers)
+
+    # The sync count going back to 0 is shown in the feed list: a new version
+    not_modified = {"not_modified": True, "etag": '"v1"', "modified": None}
+    _sync(client, auth_headers, feed_id, monkeypatch, not_modified)
+    etag = _count_etag(client, auth_headers)
+    assert etag != new_articles
+
+    _sync(client, auth_headers, feed_id, monkeypatch, not_modified)
+    assert _count_etag(client, auth_headers) == etag
+    response = client.get("/api/articles/count", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_repeated_failures_bump_the_version_once(client, auth_headers, monkeypatch):
+    feed_id = client.post("/api/feeds/", json={"name": "Broken", "url": "http://example.com/broken"},
+                          headers=auth_headers).json()["id"]
+    before = _count_etag(client, auth_headers)
+    assert _sync(client, auth_headers, feed_id, monkeypatch, None).status_code == 400
+    failed = _count_etag(client, auth_headers)
+    assert failed != before
+
+    assert _sync(client, auth_headers, feed_id, monkeypatch, None).status_code == 400
+    assert _count_etag(client, auth_headers) == failed
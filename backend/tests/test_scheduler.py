@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+
+from app.services.purge import PurgeService
+from app.services.scheduler import SyncScheduler
+
+
+def test_purge_waits_one_interval_after_startup(monkeypatch):
+    runs = []
+    monkeypatch.setattr(PurgeService, "run_scheduled", staticmethod(lambda db: runs.append(db) or {"purged": 0}))
+    scheduler = SyncScheduler()
+
+    assert scheduler.purge_if_due() is None
+    assert scheduler.purge_if_due() is None
+    assert runs == []
+    assert scheduler._next_runs["purge"] > datetime.utcnow() + timedelta(hours=23)
+
+    scheduler._next_runs["purge"] = datetime.utcnow() - timedelta(seconds=1)
+    assert scheduler.purge_if_due() == {"purged": 0}
+    assert len(runs) == 1
+    assert scheduler.purge_if_due() is None
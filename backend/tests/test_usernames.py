@@ -0,0 +1,42 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models import User
+
+MIGRATION = Path(__file__).parent.parent / "app" / "migrations" / "20261018_05_add_username_normalized_to_users.sql"
+
+
+def _register(client, username):
+    return client.post("/api/auth/register", json={"username": username, "email": f"{username}@example.org",
+                                                   "password": "secret"})
+
+
+def test_usernames_are_unique_regardless_of_case(client):
+    assert _register(client, "CaseMixed").status_code == 200
+    assert _register(client, "casemixed").status_code == 400
+    with SessionLocal() as db:
+        db.add(User(username="CASEMIXED", email="other@example.org", hashed_password="x"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+def _migrate(usernames):
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(50) UNIQUE)")
+    db.executemany("INSERT INTO users (username) VALUES (?)", [(name,) for name in usernames])
+    db.executescript(MIGRATION.read_text())
+    return db
+
+
+def test_migration_stops_on_case_collisions():
+    with pytest.raises(sqlite3.IntegrityError):
+        _migrate(["Bob", "bob", "carol"])
+
+    db = _migrate(["Bob", "carol"])
+    assert db.execute("SELECT username_normalized FROM users ORDER BY id").fetchall() == [("bob",), ("carol",)]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute("INSERT INTO users (username, username_normalized) VALUES ('BOB', 'bob')")
@@ -202,6 +202,10 @@ const api = {
         return this.request(`/feeds/${id}/sync/`, { method: 'POST' });
     },
 
+    syncAllFeeds() {
+        return this.request('/feeds/sync_all/', { method: 'POST' });
+    },
+
     // Keywords
     getKeywords() {
         return this.request('/keywords/');
@@ -227,14 +231,14 @@ const api = {
 
     // Articles
     getArticles(feedId = null, isStarred = null, minScore = 0, sortBy = "score") {
-        let url = `/articles/?limit=1000&min_score=${minScore}&sort_by=${sortBy}`;
+        let url = `/articles/?limit=1000&min_score=${minScore}&sort_by=${sortBy}&fields=summary,description,keywords`;
         if (feedId) url += `&feed_id=${feedId}`;
         if (isStarred !== null) url += `&is_starred=${isStarred}`;
         return this.request(url);
     },
 
     searchArticles(query, feedId = null) {
-        let url = `/articles/search/?limit=1000&query=${encodeURIComponent(query)}`;
+        let url = `/articles/search/?limit=1000&fields=summary,description,keywords&query=${encodeURIComponent(query)}`;
         if (feedId) url += `&feed_id=${feedId}`;
         return this.request(url);
     },
@@ -441,6 +445,7 @@ const ArticlesPage = {
                         </div>
                         <div class="article-description" v-if="article.description" v-html="addTargetBlank(article.description)"></div>
                         <div class="article-description" v-else>{{ truncate(article.description, 200) }}</div>
+                        <div class="article-description article-snippet" v-if="article.snippet" v-html="article.snippet"></div>
                         <div class="article-score">
                             <span style="font-size: 13px; color: #333; font-weight: bold;">
                                 Score: {{ article.total_score?.toFixed(1) || '0.0' }}
@@ -674,15 +679,10 @@ const ArticlesPage = {
             this.refreshing = true;
             // Sync all feeds before loading articles
             try {
-                const feeds = await this.api.getFeeds();
-                let errorMessages = [];
-                await Promise.all((feeds || []).filter(feed => feed.is_active).map(async feed => {
-                    try {
-                        await this.api.syncFeed(feed.id);
-                    } catch (err) {
-                        errorMessages.push(`Feed ${feed.name}: ${err.message}`);
-                    }
-                }));
+                const res = await this.api.syncAllFeeds();
+                const errorMessages = ((res && res.feeds) || [])
+                    .filter(f => f.status === 'failed')
+                    .map(f => `Feed ${f.name}: ${f.error}`);
                 if (errorMessages.length > 0) {
                     this.errorRibbon = errorMessages.join(' | ');
                 }
@@ -1600,7 +1600,7 @@ const AdminPage = {
                     <div v-if="openAIApiKeyError" style="color: #e74c3c; margin-top: 8px;">{{ openAIApiKeyError }}</div>
                 </div>
                 <div v-if="running" style="margin-top:10px;">Running... {{ progress }}</div>
-                <div v-if="result" style="margin-top:10px;">Rescored: {{ result.rescored_articles }}; Errors: {{ result.errors.length }}</div>
+                <div v-if="result" style="margin-top:10px;">Rescore {{ result.status }}: {{ result.processed }} articles; Errors: {{ result.error_count }}</div>
                 <div v-if="purgeResult" style="margin-top:10px;">Purged: {{ purgeResult.purged_articles || 0 }} articles</div>
             </div>
             <div v-else-if="tab === 'users'">
@@ -1750,8 +1750,14 @@ const AdminPage = {
             if (!confirm('Rescore all articles? This may take a while.')) return;
             this.running = true; this.progress = '';
             try {
-                const res = await api.request('/maintenance/rescore/', { method: 'POST' });
-                this.result = res;
+                // Rescoring runs as a background job: poll it until it finishes
+                let job = await api.request('/maintenance/rescore/', { method: 'POST' });
+                while (job.status === 'pending' || job.status === 'running') {
+                    this.progress = `${job.processed} / ${job.total}`;
+                    await new Promise(resolve => setTimeout(resolve, 2000));
+                    job = await api.request(`/maintenance/jobs/${job.id}`);
+                }
+                this.result = job;
             } catch (e) {
                 alert('Failed: ' + e.message);
             } finally {